@@ -0,0 +1,142 @@
+import sys
+
+if __name__ == "__main__":
+    input("This is a supporting file. Do not execute.\n\nPress Enter to exit.")
+    sys.exit()
+
+import asyncio
+import concurrent.futures
+import functools
+import inspect
+
+from WebdriverFramework import WebdriverMain, InvalidTypePassed
+
+# asyncio front end for WebdriverMain.
+# Each AsyncWebdriverMain owns one WebdriverMain and one executor thread. Every call for that session runs on that thread, in the order it was awaited,
+# so one event loop can drive many sessions concurrently without blocking and without a thread per call site.
+# Methods mirror WebdriverMain's (same arguments and return values) as coroutines, plus a keyword-only timeout argument.
+# Example:
+    # webd = await AsyncWebdriverMain.create(suppress_notifications = True)
+    # await webd.get_url(webd.main_win_handle, "https://www.selenium.dev/")
+    # await webd.find_click(webd.main_win_handle, "link_text", "Downloads", "Downloads link")
+    # await webd.close()
+# Timeouts and cancellation:
+    # Methods with a wait_time argument (find_ele(), find_click(), ...) get a default timeout of wait_time + command_timeout. The element wait itself times out first
+    # and returns False as usual; the asyncio timeout only fires if the browser stops answering. Other methods default to command_timeout.
+    # Pass timeout to override the default for one call. command_timeout = None disables default timeouts. A timeout raises TimeoutError.
+    # Cancelling (or timing out) a call that has not started yet removes it from the session's queue. A call that is already running cannot be interrupted:
+    # it finishes on the session thread, its result is discarded, and later calls for the session wait for it (per-session ordering is kept).
+class AsyncWebdriverMain:
+    # Use AsyncWebdriverMain.create() instead. Starting WebdriverMain launches a browser, which must not happen on the event loop.
+    # command_timeout: seconds added to wait_time (or used alone) for the default per-call timeout.
+    def __init__(self, webd, executor, command_timeout = 60):
+        if isinstance(webd, WebdriverMain) == False: raise InvalidTypePassed("webd", type(webd), WebdriverMain)
+        if isinstance(command_timeout, (int, float, type(None))) == False: raise InvalidTypePassed("command_timeout", type(command_timeout), (int, float, type(None)))
+
+        self.webd = webd # The wrapped WebdriverMain. Only touch it from the session thread (see run()).
+        self.command_timeout = command_timeout
+        self._executor = executor
+
+    # Starts a WebdriverMain on a new session thread. Arguments are passed to WebdriverMain(); suppress_notifications defaults to True,
+    # since an input() prompt would block the session thread.
+    @classmethod
+    async def create(cls, *args, command_timeout = 60, **kwargs):
+        kwargs.setdefault("suppress_notifications", True)
+        executor = concurrent.futures.ThreadPoolExecutor(max_workers = 1, thread_name_prefix = "AsyncWebdriverMain")
+        try:
+            webd = await asyncio.get_running_loop().run_in_executor(executor, functools.partial(WebdriverMain, *args, **kwargs))
+        except BaseException:
+            executor.shutdown(wait = False)
+            raise
+        return cls(webd, executor, command_timeout)
+
+    # Handle of the main window (read-only passthrough, no round trip)
+    @property
+    def main_win_handle(self): return self.webd.main_win_handle
+
+    # Locally tracked handle of the active window (read-only passthrough, no round trip)
+    @property
+    def curr_win_handle(self): return self.webd.curr_win_handle
+
+    # Runs func(self.webd, *args, **kwargs) on the session thread. Use for anything not mirrored below (e.g., lambda webd: webd.driver.title).
+    async def run(self, func, *args, timeout = None, **kwargs):
+        return await self._call(functools.partial(func, self.webd, *args, **kwargs), self.command_timeout if timeout is None else timeout)
+
+    # ----------------------------MIRRORED WEBDRIVERMAIN METHODS----------------------------
+    async def get_url(self, *args, timeout = None, **kwargs): return await self._run(self.webd.get_url, args, kwargs, timeout)
+
+    async def new_driver(self, *args, timeout = None, **kwargs): return await self._run(self.webd.new_driver, args, kwargs, timeout)
+
+    async def stop_driver(self, *args, timeout = None, **kwargs): return await self._run(self.webd.stop_driver, args, kwargs, timeout)
+
+    async def restart_driver(self, *args, timeout = None, **kwargs): return await self._run(self.webd.restart_driver, args, kwargs, timeout)
+
+    async def switch_window(self, *args, timeout = None, **kwargs): return await self._run(self.webd.switch_window, args, kwargs, timeout)
+
+    async def sync_window_handle(self, *args, timeout = None, **kwargs): return await self._run(self.webd.sync_window_handle, args, kwargs, timeout)
+
+    async def find_ele(self, *args, timeout = None, **kwargs): return await self._run(self.webd.find_ele, args, kwargs, timeout)
+
+    async def find_many(self, *args, timeout = None, **kwargs): return await self._run(self.webd.find_many, args, kwargs, timeout)
+
+    async def click_ele(self, *args, timeout = None, **kwargs): return await self._run(self.webd.click_ele, args, kwargs, timeout)
+
+    async def enter_text_ele(self, *args, timeout = None, **kwargs): return await self._run(self.webd.enter_text_ele, args, kwargs, timeout)
+
+    async def press_enter_ele(self, *args, timeout = None, **kwargs): return await self._run(self.webd.press_enter_ele, args, kwargs, timeout)
+
+    async def find_click(self, *args, timeout = None, **kwargs): return await self._run(self.webd.find_click, args, kwargs, timeout)
+
+    async def find_enter_text(self, *args, timeout = None, **kwargs): return await self._run(self.webd.find_enter_text, args, kwargs, timeout)
+
+    async def find_enter_text_enter(self, *args, timeout = None, **kwargs): return await self._run(self.webd.find_enter_text_enter, args, kwargs, timeout)
+
+    # ----------------------------CLOSING----------------------------
+    # Quits the browser (close_out()) and stops the session thread. Safe to call more than once.
+    async def close(self, timeout = None):
+        if self._executor is None: return
+        try: await self._run(self.webd.close_out, (), {}, timeout)
+        finally:
+            self._executor.shutdown(wait = False)
+            self._executor = None
+
+    async def __aenter__(self): return self
+
+    async def __aexit__(self, exc_type, exc, tb): await self.close()
+
+    # ----------------------------INTERNALS----------------------------
+    # Runs a bound WebdriverMain method on the session thread with the default timeout described above.
+    async def _run(self, method, args, kwargs, timeout):
+        if timeout is None: timeout = self._default_timeout(method, args, kwargs)
+        return await self._call(functools.partial(method, *args, **kwargs), timeout)
+
+    async def _call(self, func, timeout):
+        if self._executor is None: raise SessionClosed()
+
+        future = asyncio.get_running_loop().run_in_executor(self._executor, func)
+        if timeout is None: return await future
+        return await asyncio.wait_for(future, timeout)
+
+    # wait_time (as passed, or the method's default) + command_timeout for methods that wait for elements, else command_timeout
+    def _default_timeout(self, method, args, kwargs):
+        if self.command_timeout is None: return None
+
+        signature = _wait_time_signature(method.__func__)
+        if signature is None: return self.command_timeout
+        try: bound = signature.bind(self.webd, *args, **kwargs)
+        except TypeError: return self.command_timeout # Let the method itself raise for bad arguments
+        bound.apply_defaults()
+        return bound.arguments["wait_time"] + self.command_timeout
+
+# Signature of a WebdriverMain method (function, including self) if it has a wait_time parameter, else None.
+@functools.lru_cache(maxsize = None)
+def _wait_time_signature(func):
+    signature = inspect.signature(func)
+    return signature if "wait_time" in signature.parameters else None
+
+# ----------------------------EXCEPTIONS CLASSES----------------------------
+# Raised when calling a method of an AsyncWebdriverMain after close().
+class SessionClosed(Exception):
+    def __init__(self):
+        message = "This AsyncWebdriverMain session has been closed."
+        super().__init__(message)
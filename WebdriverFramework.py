@@ -9,51 +9,1005 @@ if __name__ == "__main__":
 from selenium import webdriver
 from selenium.webdriver.chrome.service import Service
 from webdriver_manager.chrome import ChromeDriverManager
+from selenium.webdriver.common.action_chains import ActionChains
 from selenium.webdriver.common.by import By
 from selenium.webdriver.common.keys import Keys
 from selenium.webdriver.support.ui import WebDriverWait
 from selenium.webdriver.support import expected_conditions as EC
 import selenium.common # Used for error detection when switching windows within methods
+import bisect
+import collections
 import datetime
+import fnmatch
+import functools
+import hashlib
+import itertools
+import json
 import os
+import queue
+import re
+import socket
+import subprocess
+import threading
+import time
+import urllib.parse
+import urllib.request
 
 # from datetime import timedelta
 # from time import sleep
-# from bs4 import BeautifulSoup
-# import requests
+
+# Optional. Only needed for the HTTP fast path (HttpFastPath, WebdriverMain.fetch_page()).
+try: import requests
+except ImportError: requests = None
+
+# Optional. Only needed for page snapshots (WebdriverMain.snapshot()). BeautifulSoup answers CSS queries, lxml answers XPath queries (and speeds up BeautifulSoup).
+try: from bs4 import BeautifulSoup
+except ImportError: BeautifulSoup = None
+try: import lxml.html
+except ImportError: lxml = None
+
+# ----------------------------CHROMEDRIVER RESOLUTION----------------------------
+# Environment variable that may point to a chromedriver binary. Used when no driver_path is passed to WebdriverMain().
+DRIVER_PATH_ENV_VAR = "WEBDRIVER_FRAMEWORK_CHROMEDRIVER"
+
+# On-disk cache of resolved chromedriver paths. JSON object mapping the installed Chrome version to a chromedriver path.
+DRIVER_CACHE_FILE = os.path.join(os.path.expanduser("~"), ".webdriver_framework", "chromedriver_cache.json")
+
+# Per-process memo of resolve_driver_path() results, keyed by cache_file
+_resolved_driver_paths = {}
+_resolve_lock = threading.Lock()
+
+# Returns the path of the chromedriver binary to start.
+# Resolution order (first hit wins):
+    # 1. driver_path argument, then the DRIVER_PATH_ENV_VAR environment variable. Never validated against the Chrome version.
+    # 2. Per-process memo. Restarts within one process cost nothing.
+    # 3. On-disk cache entry for the installed Chrome version (detected locally, no network).
+    # 4. ChromeDriverManager().install() (version discovery/download over the network). The result is stored in the on-disk cache.
+# Once the cache is warm, no network access happens. Raises whatever ChromeDriverManager raises if it has to be used and fails.
+# cache_file defaults to DRIVER_CACHE_FILE.
+def resolve_driver_path(driver_path = None, cache_file = None):
+    if driver_path is None: driver_path = os.environ.get(DRIVER_PATH_ENV_VAR) or None
+    if driver_path is not None: return driver_path
+    if cache_file is None: cache_file = DRIVER_CACHE_FILE
+
+    with _resolve_lock:
+        if cache_file in _resolved_driver_paths: return _resolved_driver_paths[cache_file]
+
+        chrome_version = _local_chrome_version() or "unknown"
+        cache = _read_json_file(cache_file)
+
+        resolved = cache.get(chrome_version)
+        if resolved is None or os.path.isfile(resolved) == False:
+            resolved = ChromeDriverManager().install()
+            cache[chrome_version] = resolved
+            _write_json_file(cache_file, cache)
+
+        _resolved_driver_paths[cache_file] = resolved
+        return resolved
+
+# Installed Chrome version as reported by the OS (runs a local command, no network). None if it cannot be determined.
+def _local_chrome_version():
+    try:
+        from webdriver_manager.core.os_manager import OperationSystemManager, ChromeType
+        return OperationSystemManager().get_browser_version_from_os(ChromeType.GOOGLE)
+    except Exception:
+        return None
+
+def _read_json_file(cache_file):
+    try:
+        with open(cache_file, encoding = "utf-8") as f: cache = json.load(f)
+    except (OSError, ValueError):
+        return {}
+    return cache if isinstance(cache, dict) else {}
+
+# Atomic write (temp file + rename), so readers never see half a file. Failure to write is not an error (used for caches and session files,
+# which the next process can do without).
+def _write_json_file(cache_file, cache):
+    try:
+        os.makedirs(os.path.dirname(os.path.abspath(cache_file)), exist_ok = True)
+        tmp_file = f"{cache_file}.{os.getpid()}.tmp"
+        with open(tmp_file, "w", encoding = "utf-8") as f: json.dump(cache, f, indent = 2)
+        os.replace(tmp_file, cache_file)
+    except OSError:
+        pass
+
+# ----------------------------SESSION PERSISTENCE----------------------------
+# WebdriverMain(session_file = ...) stores a session descriptor in session_file (JSON) so that a later process can reattach to the same browser
+# instead of launching a new one:
+    # executor_url: URL of the WebDriver server that owns the session
+    # session_id, capabilities: the WebDriver session
+    # window_handles, main_win_handle: windows at the time of saving (see WebdriverMain.save_session())
+    # detached: True if WebdriverMain started that chromedriver itself (start_detached_chromedriver()), so it is shut down along with the session
+    # profile_dir: Chrome user data directory of the session
+# A browser started by webdriver.Chrome() dies with the process that started it, so with a session_file, new_driver() starts chromedriver as a detached
+# process instead (unless executor_url points at a server that outlives the process anyway, e.g. Selenium Grid).
+
+# Starts chromedriver in its own process group (it outlives this process) on a free local port. Returns its URL once it answers /status.
+def start_detached_chromedriver(driver_path, timeout = 10):
+    with socket.socket() as free_socket:
+        free_socket.bind(("127.0.0.1", 0))
+        port = free_socket.getsockname()[1]
+
+    if os.name == "nt": detach = {"creationflags": subprocess.DETACHED_PROCESS | subprocess.CREATE_NEW_PROCESS_GROUP}
+    else: detach = {"start_new_session": True}
+    subprocess.Popen([driver_path, f"--port={port}"], stdin = subprocess.DEVNULL, stdout = subprocess.DEVNULL, stderr = subprocess.DEVNULL, **detach)
+
+    url = f"http://127.0.0.1:{port}"
+    deadline = time.monotonic() + timeout
+    while True:
+        try:
+            with urllib.request.urlopen(f"{url}/status", timeout = 1) as response:
+                if json.load(response).get("value", {}).get("ready"): return url
+        except (OSError, ValueError):
+            pass
+        if time.monotonic() >= deadline: raise TimeoutError(f"chromedriver at {url} did not start within {timeout} seconds")
+        time.sleep(0.05)
+
+# Asks a chromedriver started by start_detached_chromedriver() to exit. Quietly does nothing if it is already gone.
+def _shutdown_chromedriver(executor_url):
+    try: urllib.request.urlopen(f"{executor_url}/shutdown", timeout = 2).close()
+    except OSError: pass
+
+# Remote driver that joins an existing session instead of creating one
+class _AttachedRemote(webdriver.Remote):
+    def __init__(self, command_executor, session_id, capabilities, options):
+        self._attach_to = (session_id, capabilities)
+        super().__init__(command_executor = command_executor, options = options)
+
+    def start_session(self, capabilities):
+        self.session_id, self.caps = self._attach_to
+
+# ----------------------------ELEMENT LOOKUP SCRIPT----------------------------
+# Accepted search_by arguments for find_ele() and find_many()
+SEARCH_BY_OPTIONS = ("id", "name", "xpath", "link_text", "partial_link_text", "tag_name", "class_name", "css_selector")
+
+# search_by -> Selenium locator strategy, for lookups that can't use the locator scripts below
+_SEARCH_BY_LOCATORS = {
+    "id": By.ID, "name": By.NAME, "xpath": By.XPATH, "link_text": By.LINK_TEXT, "partial_link_text": By.PARTIAL_LINK_TEXT,
+    "tag_name": By.TAG_NAME, "class_name": By.CLASS_NAME, "css_selector": By.CSS_SELECTOR,
+}
+
+# Shared by LOCATE_SCRIPT and OBSERVE_SCRIPT. Defines locate(searchBy, searchFor) -> array of elements, and
+# locateAll(queries) -> object of name -> element (or null), or name -> array of elements if the query is multiple.
+# queries is a list of [name, search_by, search_for, multiple]. search_by uses the find_ele() vocabulary.
+# link_text/partial_link_text compare against the trimmed text of <a> elements, like Selenium does.
+_LOCATE_FUNCTIONS = """
+var locate = function(searchBy, searchFor) {
+    var found = [];
+    switch (searchBy) {
+        case "id": found = document.querySelectorAll('[id="' + CSS.escape(searchFor) + '"]'); break;
+        case "name": found = document.getElementsByName(searchFor); break;
+        case "tag_name": found = document.getElementsByTagName(searchFor); break;
+        case "class_name": found = document.getElementsByClassName(searchFor); break;
+        case "css_selector": found = document.querySelectorAll(searchFor); break;
+        case "xpath":
+            var snapshot = document.evaluate(searchFor, document, null, XPathResult.ORDERED_NODE_SNAPSHOT_TYPE, null);
+            for (var i = 0; i < snapshot.snapshotLength; i++) found.push(snapshot.snapshotItem(i));
+            break;
+        case "link_text":
+        case "partial_link_text":
+            var links = document.getElementsByTagName("a");
+            for (var j = 0; j < links.length; j++) {
+                var text = (links[j].innerText || links[j].textContent || "").trim();
+                if (searchBy == "link_text" ? text == searchFor : text.indexOf(searchFor) != -1) found.push(links[j]);
+            }
+            break;
+    }
+    return Array.prototype.slice.call(found);
+};
+var locateAll = function(queries) {
+    var result = {};
+    for (var k = 0; k < queries.length; k++) {
+        var found = queries[k][2] == "" ? [] : locate(queries[k][1], queries[k][2]);
+        result[queries[k][0]] = queries[k][3] ? found : (found.length ? found[0] : null);
+    }
+    return result;
+};
+"""
+
+# Runs in the browser (execute_script). Resolves a batch of selectors in one round trip.
+# arguments[0] is a list of [name, search_by, search_for, multiple]. Returns locateAll(arguments[0]).
+# The marker comment lets stand-in servers (see benchmarks/) recognise the script.
+LOCATE_SCRIPT = "/* webdriver-framework:locate */" + _LOCATE_FUNCTIONS + "return locateAll(arguments[0]);"
+
+# Runs in the browser (execute_async_script). Waits for a batch of selectors without polling:
+# checks once, then re-checks on every DOM mutation (MutationObserver) and answers as soon as all required names are found.
+# arguments: queries (as for LOCATE_SCRIPT), list of required names, timeout in milliseconds.
+# Answers {complete: true, found: locateAll(queries)}, or {complete: false, found: <last locateAll(queries)>} if still incomplete at the timeout (to report what is missing).
+OBSERVE_SCRIPT = "/* webdriver-framework:observe */" + _LOCATE_FUNCTIONS + """
+var queries = arguments[0], required = arguments[1], timeoutMs = arguments[2], done = arguments[arguments.length - 1];
+var last = null;
+// Only multiple queries answer arrays. Single elements may have a length of their own (<select> options, <form> controls).
+var check = function() {
+    last = locateAll(queries);
+    for (var i = 0; i < required.length; i++) {
+        var value = last[required[i]];
+        if (Array.isArray(value) ? value.length === 0 : value == null) return false;
+    }
+    return true;
+};
+if (check()) { done({complete: true, found: last}); return; }
+var finished = false, scheduled = false, observer, timer;
+var finish = function(complete) {
+    if (finished) return;
+    finished = true;
+    observer.disconnect();
+    clearTimeout(timer);
+    done({complete: complete, found: last});
+};
+// Mutations arrive in bursts; one check per task is enough
+observer = new MutationObserver(function() {
+    if (scheduled || finished) return;
+    scheduled = true;
+    setTimeout(function() {
+        scheduled = false;
+        if (check()) finish(true);
+    }, 0);
+});
+observer.observe(document, {childList: true, subtree: true, attributes: true, characterData: true});
+// A last check, in case the elements appeared after the last scheduled one
+timer = setTimeout(function() { finish(check()); }, timeoutMs);"""
+
+# ----------------------------WAIT STRATEGIES----------------------------
+# Accepted wait_strategy arguments (WebdriverMain(), find_ele(), find_many() and the find_* composites):
+    # "poll": WebDriverWait, one round trip every 0.5 seconds. An element that appears just after a poll costs up to 0.5 seconds of dead time.
+    # "observe": one execute_async_script round trip that installs a MutationObserver and answers as soon as the selector matches.
+        # Falls back to adaptive polling with native find_elements for the rest of wait_time if the script can't run (JavaScript disabled/blocked,
+        # or the page navigates away mid-wait).
+    # "adaptive": polls with back-off, starting at ADAPTIVE_POLL_START seconds and doubling up to ADAPTIVE_POLL_MAX. Quick for elements that are nearly there, cheap for slow ones.
+WAIT_STRATEGIES = ("poll", "observe", "adaptive")
+ADAPTIVE_POLL_START = 0.025
+ADAPTIVE_POLL_MAX = 0.25
+
+# ----------------------------STEP PIPELINES----------------------------
+# Steps accepted by WebdriverMain.run_steps(). Each step is a tuple: (action, *arguments, fail_msg). fail_msg works like the helpers' fail_msg.
+    # ("navigate", url, fail_msg)
+    # ("find", search_by, search_for, fail_msg): just finds the element (it is returned in run_steps()' results)
+    # ("wait_for", search_by, search_for, fail_msg): waits until the element is present
+    # ("type", search_by, search_for, text, fail_msg)
+    # ("press_enter", search_by, search_for, fail_msg)
+    # ("click", search_by, search_for, fail_msg)
+# Number of arguments per action, fail_msg included
+STEP_ACTIONS = {"navigate": 2, "find": 3, "wait_for": 3, "type": 4, "press_enter": 3, "click": 3}
+
+# Splits steps into batches (lists of step indexes) for run_steps(). A batch is either one navigate step, or a run of element steps that ends after
+# the first click/press_enter (those may change the page, so elements used by later steps are located after them).
+# A find/wait_for that follows typing in the same batch starts a new batch, so it waits for what the typing makes appear (e.g., autocomplete suggestions).
+# All elements of a batch are located with one wait.
+def _compile_steps(steps):
+    batches, current = [], []
+    for index, step in enumerate(steps):
+        if step[0] == "navigate":
+            if current: batches.append(current)
+            batches.append([index])
+            current = []
+            continue
+
+        if step[0] in ("find", "wait_for") and any(steps[previous][0] == "type" for previous in current):
+            batches.append(current)
+            current = []
+
+        current.append(index)
+        if step[0] in ("click", "press_enter"):
+            batches.append(current)
+            current = []
+    if current: batches.append(current)
+    return batches
+
+# ----------------------------LAUNCH PROFILES----------------------------
+# URL patterns (Network.setBlockedURLs syntax, * is a wildcard) for files with the given extensions.
+# Each extension is anchored to the end of the path, with or without a query string, so that "css" doesn't also block "/docs/some.cssguide.html".
+def _extension_patterns(*extensions):
+    return tuple(pattern for extension in extensions for pattern in (f"*.{extension}", f"*.{extension}?*"))
+
+# URL patterns used to block whole resource types by file extension
+RESOURCE_TYPE_PATTERNS = {
+    "image": _extension_patterns("png", "jpg", "jpeg", "gif", "webp", "svg", "ico", "avif"),
+    "font": _extension_patterns("woff", "woff2", "ttf", "otf", "eot"),
+    "media": _extension_patterns("mp4", "webm", "mp3", "ogg", "wav", "m3u8"),
+    "stylesheet": _extension_patterns("css"),
+}
+
+# Third-party analytics/ads/widgets that server-rendered pages rarely need
+THIRD_PARTY_PATTERNS = (
+    "*google-analytics.com*", "*googletagmanager.com*", "*doubleclick.net*", "*googlesyndication.com*",
+    "*facebook.net*", "*connect.facebook.com*", "*hotjar.com*", "*segment.io*", "*newrelic.com*", "*nr-data.net*",
+)
+
+# Named launch profiles for WebdriverMain(profile = ...). Keys:
+    # headless: run Chrome without a window
+    # page_load_strategy: "normal" (get_url() waits for every resource), "eager" (waits for the DOM only) or "none" (returns right away; rely on find_ele() waits)
+    # disable_images: don't load images at all (Chrome content setting)
+    # disable_extensions: start Chrome with --disable-extensions
+    # blocked_resource_types: keys of RESOURCE_TYPE_PATTERNS to block via CDP
+    # blocked_url_patterns: extra URL patterns to block via CDP
+    # arguments: extra Chrome command line arguments
+# A dict can be passed instead of a name. Missing keys are taken from "interactive".
+LAUNCH_PROFILES = {
+    # Default. A normal, visible browser, as before profiles existed.
+    "interactive": {
+        "headless": False,
+        "page_load_strategy": "normal",
+        "disable_images": False,
+        "disable_extensions": False,
+        "blocked_resource_types": (),
+        "blocked_url_patterns": (),
+        "arguments": (),
+    },
+    # Unattended automation of pages that still need to behave normally (styles kept, so layout/visibility checks work)
+    "headless-fast": {
+        "headless": True,
+        "page_load_strategy": "eager",
+        "disable_images": True,
+        "disable_extensions": True,
+        "blocked_resource_types": ("font", "media"),
+        "blocked_url_patterns": THIRD_PARTY_PATTERNS,
+        "arguments": ("--no-first-run", "--disable-background-networking", "--disable-default-apps", "--mute-audio"),
+    },
+    # Reading data only. Everything that doesn't carry content is blocked.
+    "scrape": {
+        "headless": True,
+        "page_load_strategy": "eager",
+        "disable_images": True,
+        "disable_extensions": True,
+        "blocked_resource_types": ("image", "font", "media", "stylesheet"),
+        "blocked_url_patterns": THIRD_PARTY_PATTERNS,
+        "arguments": ("--no-first-run", "--disable-background-networking", "--disable-default-apps", "--mute-audio", "--blink-settings=imagesEnabled=false"),
+    },
+}
+
+# Returns the full settings dict for a profile name or a (partial) profile dict. Raises InvalidLaunchProfile for unknown names/keys/values.
+def resolve_launch_profile(profile):
+    if isinstance(profile, str):
+        if profile not in LAUNCH_PROFILES: raise InvalidLaunchProfile(profile)
+        profile = LAUNCH_PROFILES[profile]
+    elif isinstance(profile, dict) == False: raise InvalidTypePassed("profile", type(profile), (str, dict))
+
+    unknown_keys = set(profile) - set(LAUNCH_PROFILES["interactive"])
+    if unknown_keys: raise InvalidLaunchProfile(f"keys {sorted(unknown_keys)}")
+
+    settings = {**LAUNCH_PROFILES["interactive"], **profile}
+    if settings["page_load_strategy"] not in ("normal", "eager", "none"): raise InvalidLaunchProfile(f"page_load_strategy {settings['page_load_strategy']!r}")
+    for resource_type in settings["blocked_resource_types"]:
+        if resource_type not in RESOURCE_TYPE_PATTERNS: raise InvalidLaunchProfile(f"blocked_resource_types {resource_type!r}")
+    return settings
+
+# ----------------------------PAGE SNAPSHOTS----------------------------
+# Parsed copy of one page's HTML (see WebdriverMain.snapshot()). All queries run locally, without round trips to the browser.
+# Parsing is lazy and happens once per snapshot: the first CSS query builds a BeautifulSoup tree (lxml parser if installed), the first XPath query builds an lxml tree.
+    # select()/select_one() return BeautifulSoup Tags
+    # xpath() returns whatever lxml returns for the expression (elements, strings, numbers)
+    # texts()/attrs()/extract() return plain strings, for bulk extraction
+class PageSnapshot:
+    def __init__(self, html, window_handle = None):
+        self.html = html
+        self.window_handle = window_handle
+        self.content_hash = hashlib.sha1(html.encode("utf-8", "surrogatepass")).hexdigest()
+        self._soup = None
+        self._tree = None
+
+    @property
+    def soup(self):
+        if self._soup is None:
+            if BeautifulSoup is None: raise MissingOptionalModule("bs4", "CSS queries on page snapshots")
+            self._soup = BeautifulSoup(self.html, "lxml" if lxml is not None else "html.parser")
+        return self._soup
+
+    @property
+    def tree(self):
+        if self._tree is None:
+            if lxml is None: raise MissingOptionalModule("lxml", "XPath queries on page snapshots")
+            self._tree = lxml.html.fromstring(self.html)
+        return self._tree
+
+    def select(self, css_selector): return self.soup.select(css_selector)
+
+    def select_one(self, css_selector): return self.soup.select_one(css_selector)
+
+    def xpath(self, expression): return self.tree.xpath(expression)
+
+    # Stripped text of every element matching css_selector
+    def texts(self, css_selector): return [tag.get_text(strip = True) for tag in self.select(css_selector)]
+
+    # Attribute value of every element matching css_selector (None where the attribute is missing)
+    def attrs(self, css_selector, attribute): return [tag.get(attribute) for tag in self.select(css_selector)]
+
+    # Bulk extraction. fields is a dict of name -> css_selector, or name -> (css_selector, attribute). Returns a dict of name -> list of strings.
+    def extract(self, fields):
+        return {
+            name: self.attrs(*query) if isinstance(query, (list, tuple)) else self.texts(query)
+            for name, query in fields.items()
+        }
+
+# LRU cache of PageSnapshots keyed by (window handle, content hash), so a page that hasn't changed is never parsed twice.
+# hits/misses count lookups, to tune maxsize.
+class SnapshotCache:
+    def __init__(self, maxsize = 16):
+        if isinstance(maxsize, int) == False or maxsize < 0: raise InvalidTypePassed("maxsize", type(maxsize), "int >= 0")
+
+        self.maxsize = maxsize
+        self.hits = 0
+        self.misses = 0
+        self._entries = collections.OrderedDict()
+        self._lock = threading.Lock()
+
+    # Returns the cached snapshot for this window and content, or stores and returns a new one
+    def get(self, window_handle, html):
+        snapshot = PageSnapshot(html, window_handle)
+        key = (window_handle, snapshot.content_hash)
+        with self._lock:
+            cached = self._entries.get(key)
+            if cached is not None:
+                self._entries.move_to_end(key)
+                self.hits += 1
+                return cached
+
+            self.misses += 1
+            if self.maxsize == 0: return snapshot
+            self._entries[key] = snapshot
+            while len(self._entries) > self.maxsize: self._entries.popitem(last = False)
+            return snapshot
+
+    def clear(self):
+        with self._lock: self._entries.clear()
+
+    def __len__(self): return len(self._entries)
+
+# ----------------------------LOCATOR CACHE----------------------------
+# Optional cache of found elements for WebdriverMain (locator_cache argument), keyed by (window handle, search_by, search_for).
+# find_ele() reuses a cached element after a cheap attached check (one round trip, no locator search and no wait). find_click(), find_enter_text() and
+# find_enter_text_enter() skip the check and act on the cached element directly. Either way, a StaleElementReferenceException makes the lookup a miss.
+# Entries expire after ttl seconds and the least recently used entries are dropped beyond maxsize. WebdriverMain drops a window's entries when it
+# navigates (get_url()) or is switched to (its page may have changed in the meantime), and all entries when a new driver starts.
+# Counters, to tune maxsize/ttl:
+    # hits: lookups answered from the cache
+    # misses: lookups that had to search the page (not cached, expired, or stale)
+    # stale: cached elements that turned out to be detached from the page (also counted in misses)
+class LocatorCache:
+    def __init__(self, maxsize = 64, ttl = 30):
+        if isinstance(maxsize, int) == False or maxsize < 1: raise InvalidTypePassed("maxsize", type(maxsize), "int >= 1")
+        if isinstance(ttl, (int, float)) == False or ttl <= 0: raise InvalidTypePassed("ttl", type(ttl), "number > 0")
+
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self.hits = 0
+        self.misses = 0
+        self.stale = 0
+        self._entries = collections.OrderedDict() # key -> (element, time stored)
+        self._lock = threading.Lock()
+
+    # Returns the cached element for key (window handle, search_by, search_for), or None.
+    # count = False leaves hits/misses alone, for callers that count the lookup themselves (see count_hit()).
+    def get(self, key, count = True):
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None and time.monotonic() - entry[1] > self.ttl:
+                del self._entries[key]
+                entry = None
+            if entry is None:
+                if count: self.misses += 1
+                return None
+
+            self._entries.move_to_end(key)
+            if count: self.hits += 1
+            return entry[0]
+
+    def count_hit(self):
+        with self._lock: self.hits += 1
+
+    def put(self, key, element):
+        with self._lock:
+            self._entries[key] = (element, time.monotonic())
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.maxsize: self._entries.popitem(last = False)
+
+    # Drops an element returned by get() that turned out to be stale. If get() counted the lookup as a hit, it becomes a miss.
+    def discard_stale(self, key, counted = True):
+        with self._lock:
+            self._entries.pop(key, None)
+            self.stale += 1
+            if counted:
+                self.hits -= 1
+                self.misses += 1
+
+    # Drops every entry of one window
+    def invalidate(self, window_handle):
+        with self._lock:
+            for key in [key for key in self._entries if key[0] == window_handle]: del self._entries[key]
+
+    def clear(self):
+        with self._lock: self._entries.clear()
+
+    # Share of lookups answered from the cache (0.0 before any lookup)
+    def hit_rate(self):
+        lookups = self.hits + self.misses
+        return self.hits / lookups if lookups else 0.0
+
+    def __len__(self): return len(self._entries)
+
+# ----------------------------HTTP FAST PATH----------------------------
+# Routes for HttpFastPath rules
+    # "http": always fetch over HTTP (never falls back to the browser, except on connection errors and non-HTML responses)
+    # "browser": always navigate the browser
+    # "auto": fetch over HTTP, fall back to the browser when needs_browser() says the page needs JavaScript
+HTTP_ROUTES = ("http", "browser", "auto")
+
+# Used by HttpFastPath.needs_browser()
+_SCRIPT_STYLE_RE = re.compile(r"<(script|style|template)\b.*?</\1\s*>", re.IGNORECASE | re.DOTALL)
+_NOSCRIPT_RE = re.compile(r"<noscript\b(.*?)</noscript\s*>", re.IGNORECASE | re.DOTALL)
+_TAG_RE = re.compile(r"<[^>]+>")
+
+# Whether a requests response is an HTML page (a missing Content-Type counts as HTML). Anything else (JSON, PDF, ...) can't become a PageSnapshot.
+def _is_html_response(response): return "html" in response.headers.get("Content-Type", "text/html")
+
+# Optional fast path for WebdriverMain.fetch_page() (http_fast_path argument): fetches server-rendered pages with a connection-pooled requests.Session
+# instead of a full browser navigation. Cookies are shared with the driver both ways (see WebdriverMain.fetch_page()).
+# Arguments:
+    # rules: iterable of (url_pattern, route) pairs. Patterns use "*" wildcards, like the blocked_url_patterns of launch profiles; the first matching rule wins.
+        # Unmatched URLs use the "auto" route (see HTTP_ROUTES).
+    # pool_size: connections kept open per host
+    # timeout: seconds per HTTP request
+    # min_text_chars: "auto" pages with scripts and less visible text than this are treated as JavaScript-rendered
+    # headers: extra headers for every request. The browser's User-Agent is added by WebdriverMain.fetch_page() unless set here.
+# stats counts fetch_page() calls per path: "http" (served over HTTP), "browser" (navigated; includes fallbacks) and "fallbacks" (fetched over HTTP first,
+# then sent to the browser). See split().
+class HttpFastPath:
+    def __init__(self,
+            rules = (),
+            pool_size = 10,
+            timeout = 15,
+            min_text_chars = 200,
+            headers = None
+    ):
+        if requests is None: raise MissingOptionalModule("requests", "the HTTP fast path")
+        self.rules = []
+        for rule in rules:
+            if isinstance(rule, (list, tuple)) == False or len(rule) != 2 or isinstance(rule[0], str) == False: raise InvalidTypePassed("rules", type(rule), "(url_pattern, route) pairs")
+            if rule[1] not in HTTP_ROUTES: raise InvalidTypePassed("route", rule[1], HTTP_ROUTES)
+            self.rules.append((rule[0], rule[1]))
+
+        self.timeout = timeout
+        self.min_text_chars = min_text_chars
+
+        self.session = requests.Session()
+        self.copy_user_agent = headers is None or "User-Agent" not in headers # fetch_page() copies the browser's User-Agent on first use
+        adapter = requests.adapters.HTTPAdapter(pool_connections = pool_size, pool_maxsize = pool_size)
+        self.session.mount("http://", adapter)
+        self.session.mount("https://", adapter)
+        if headers is not None: self.session.headers.update(headers)
+
+        self.synced_at = None # (driver, command count) when the driver's cookies were last loaded. See WebdriverMain._sync_http_cookies().
+        self._known_cookies = {} # (domain, path, name) -> value, as last seen in the driver or the session
+        self._new_cookies = {} # (domain, path, name) -> cookie set over HTTP, not yet copied to the driver
+
+        self.stats = collections.Counter()
+        self._lock = threading.Lock()
+
+    # Route for url (see HTTP_ROUTES)
+    def route(self, url):
+        for pattern, route in self.rules:
+            if fnmatch.fnmatchcase(url, pattern): return route
+        return "auto"
+
+    # GET over the pooled session. Cookies the response adds or changes are kept for pop_new_cookies().
+    def get(self, url):
+        response = self.session.get(url, timeout = self.timeout)
+        with self._lock:
+            for cookie in self.session.cookies:
+                key = (cookie.domain, cookie.path, cookie.name)
+                if self._known_cookies.get(key) == cookie.value: continue
+                self._known_cookies[key] = cookie.value
+                self._new_cookies[key] = cookie
+        return response
+
+    # Loads cookies in WebDriver format ({"name", "value", "domain", "path", "secure", ...}) into the session
+    def load_cookies(self, cookies):
+        with self._lock:
+            for cookie in cookies:
+                domain, path = cookie.get("domain", ""), cookie.get("path", "/")
+                self.session.cookies.set(cookie["name"], cookie["value"], domain = domain, path = path, secure = cookie.get("secure", False))
+                self._known_cookies[(domain, path, cookie["name"])] = cookie["value"]
+
+    # Cookies set over HTTP that the driver doesn't have yet, as (url, cookie) pairs: url is where the cookie applies, cookie is in WebDriver format.
+    # Host-only cookies (set without a Domain attribute) have no "domain", so that the driver doesn't send them to subdomains; url names their host.
+    # Clears the list.
+    def pop_new_cookies(self):
+        with self._lock:
+            cookies, self._new_cookies = list(self._new_cookies.values()), {}
+        driver_cookies = []
+        for cookie in cookies:
+            url = f"{'https' if cookie.secure else 'http'}://{cookie.domain.lstrip('.')}{cookie.path}"
+            driver_cookie = {"name": cookie.name, "value": cookie.value, "path": cookie.path, "secure": bool(cookie.secure)}
+            if cookie.domain_specified: driver_cookie["domain"] = cookie.domain
+            if cookie.expires is not None: driver_cookie["expiry"] = int(cookie.expires)
+
+            # cookiejar keeps HttpOnly and SameSite as nonstandard attributes, spelled as the server sent them
+            attributes = {key.lower(): value for key, value in cookie._rest.items()}
+            driver_cookie["httpOnly"] = "httponly" in attributes
+            # Without the attribute, leave sameSite out (the browser's default): Chrome rejects sameSite "None" on cookies that aren't secure
+            same_site = attributes.get("samesite")
+            if same_site is not None and same_site.capitalize() in ("Strict", "Lax", "None"): driver_cookie["sameSite"] = same_site.capitalize()
+            driver_cookies.append((url, driver_cookie))
+        return driver_cookies
+
+    # Content heuristic for the "auto" route. A response needs the browser if it is an error (the browser may get through, e.g. bot checks),
+    # is not HTML (JSON, PDF, ...), or is HTML that asks for JavaScript in <noscript>, or has scripts but almost no text outside them (a client-rendered app shell).
+    def needs_browser(self, response):
+        if response.status_code >= 400: return True
+        if _is_html_response(response) == False: return True
+
+        html = response.text
+        if any("javascript" in noscript.lower() for noscript in _NOSCRIPT_RE.findall(html)): return True
+        if "<script" not in html.lower(): return False
+        text = _TAG_RE.sub(" ", _SCRIPT_STYLE_RE.sub(" ", _NOSCRIPT_RE.sub(" ", html)))
+        return len("".join(text.split())) < self.min_text_chars
+
+    def count(self, path):
+        with self._lock: self.stats[path] += 1
+
+    # Browser vs. HTTP split of fetch_page() calls so far
+    def split(self):
+        with self._lock:
+            total = self.stats["http"] + self.stats["browser"]
+            return {
+                "http": self.stats["http"],
+                "browser": self.stats["browser"],
+                "fallbacks": self.stats["fallbacks"],
+                "http_share": self.stats["http"] / total if total else 0.0,
+            }
+
+    def close(self): self.session.close()
+
+# ----------------------------ERROR STORE----------------------------
+# Default error sink for WebdriverMain (error_store argument). Memory stays flat no matter how many errors a run hits:
+    # errors: the capacity most recent errors, as (time stamp, error) tuples (error is a captured Exception or a string). WebdriverMain.error_col is this deque.
+    # counts: number of errors per exception type name ("str" for text errors), over the whole run
+    # total: number of errors recorded over the whole run
+# If jsonl_path is given, every error is also streamed to that file as one JSON object per line ({"time", "type", "error", "message"}) by a background writer thread.
+# The file rotates at max_bytes, keeping backup_count old files (jsonl_path.1, jsonl_path.2, ...). If the writer falls more than queue_size errors behind,
+# further errors are left out of the file (counted in dropped) rather than queued without bound.
+# Any object with record(error, fail_msg), errors, total and close() can be passed to WebdriverMain instead.
+class ErrorStore:
+    def __init__(self,
+            capacity = 200,
+            jsonl_path = None,
+            max_bytes = 10 * 1024 * 1024,
+            backup_count = 3,
+            queue_size = 1000
+    ):
+        if isinstance(capacity, int) == False or capacity < 1: raise InvalidTypePassed("capacity", type(capacity), "int >= 1")
+        if isinstance(jsonl_path, (str, type(None))) == False: raise InvalidTypePassed("jsonl_path", type(jsonl_path), (str, type(None)))
+
+        self.errors = collections.deque(maxlen = capacity)
+        self.counts = collections.Counter()
+        self.total = 0
+        self.dropped = 0
+
+        self.jsonl_path = jsonl_path
+        self.max_bytes = max_bytes
+        self.backup_count = backup_count
+        self._lock = threading.Lock()
+        self._queue = None
+        self._writer = None
+        if jsonl_path is not None:
+            self._queue = queue.Queue(maxsize = queue_size)
+            self._writer = threading.Thread(target = self._write_loop, args = (self._queue,), name = "ErrorStore-writer", daemon = True)
+            self._writer.start()
+
+    # Records one error. Never blocks on file I/O.
+    def record(self, error, fail_msg = None):
+        time_stamp = datetime.datetime.now()
+        error_type = type(error).__name__
+
+        with self._lock:
+            self.errors.append((time_stamp, error))
+            self.counts[error_type] += 1
+            self.total += 1
+
+            # Read under the lock: close() may drop the queue at any time
+            if self._queue is None: return
+            try:
+                self._queue.put_nowait({"time": time_stamp.isoformat(), "type": error_type, "error": str(error), "message": fail_msg})
+            except queue.Full:
+                self.dropped += 1
+
+    # Snapshot of the counters, e.g. for a status page
+    def summary(self):
+        with self._lock:
+            return {"total": self.total, "dropped": self.dropped, "counts": dict(self.counts)}
+
+    # Flushes and stops the writer thread (waiting up to timeout seconds for it). Errors recorded afterwards are kept in memory only. Safe to call more than once.
+    def close(self, timeout = 10):
+        with self._lock:
+            writer, errors_queue = self._writer, self._queue
+            self._writer = None
+            self._queue = None
+        if writer is None: return
+
+        if writer.is_alive():
+            try: errors_queue.put(_STOP_WRITER, timeout = timeout)
+            except queue.Full: return # The writer is stuck. It is a daemon thread, so it won't keep the process alive.
+        writer.join(timeout)
+
+    # Writer thread. Failing file I/O (unopenable path, full disk) never stops it: the errors that can't be written are counted in dropped
+    # and the file is reopened for the next one, so the queue keeps draining and close() can't block on it.
+    def _write_loop(self, errors_queue):
+        out = None
+        try:
+            while True:
+                item = errors_queue.get()
+                if item is _STOP_WRITER: return
+
+                try:
+                    line = json.dumps(item, default = str) + "\n"
+                    if out is None: out = open(self.jsonl_path, "a", encoding = "utf-8")
+                    if out.tell() > 0 and out.tell() + len(line) > self.max_bytes:
+                        out.close()
+                        out = None
+                        self._rotate()
+                        out = open(self.jsonl_path, "a", encoding = "utf-8")
+                    out.write(line)
+                    # Flushes when the writer catches up, so the file is current without a flush per line under bursts
+                    if errors_queue.empty(): out.flush()
+                except OSError:
+                    with self._lock: self.dropped += 1
+                    if out is not None:
+                        try: out.close()
+                        except OSError: pass
+                        out = None
+        finally:
+            if out is not None:
+                try: out.close()
+                except OSError: pass
+
+    # jsonl_path -> jsonl_path.1 -> jsonl_path.2 ... The oldest file is removed.
+    def _rotate(self):
+        for index in range(self.backup_count, 0, -1):
+            source = self.jsonl_path if index == 1 else f"{self.jsonl_path}.{index - 1}"
+            if os.path.exists(source): os.replace(source, f"{self.jsonl_path}.{index}")
+        if self.backup_count == 0 and os.path.exists(self.jsonl_path): os.remove(self.jsonl_path)
+
+# Marker telling the ErrorStore writer thread to exit
+_STOP_WRITER = object()
+
+# ----------------------------INSTRUMENTATION----------------------------
+# Fixed-bucket histogram. observe() is a bisect and three additions, so it can stay on in production.
+class Histogram:
+    def __init__(self, buckets):
+        self.buckets = tuple(sorted(buckets)) # Upper bounds. Values above the last bound only go to the implicit +Inf bucket.
+        self.counts = [0] * (len(self.buckets) + 1) # Per bucket (not cumulative). The last entry is +Inf.
+        self.sum = 0
+        self.count = 0
+
+    def observe(self, value):
+        self.counts[bisect.bisect_left(self.buckets, value)] += 1
+        self.sum += value
+        self.count += 1
+
+    # Cumulative (upper bound, count) pairs, Prometheus style. The last upper bound is float("inf").
+    def cumulative(self):
+        return list(zip(self.buckets + (float("inf"),), itertools.accumulate(self.counts)))
+
+    def snapshot(self):
+        return {"buckets": dict(self.cumulative()), "sum": self.sum, "count": self.count}
+
+# Opt-in per-method metrics for WebdriverMain (metrics argument/attribute). One instance may be shared by many WebdriverMain objects (thread-safe).
+# For every call of a public WebdriverMain method (including calls made by composite helpers, e.g. find_ele() inside find_click()) records:
+    # wall time (seconds), WebDriver commands issued, wait-poll iterations (element waits), and success or failure.
+# A call fails if it raises, returns False, or records an error (display_err_msg()/log_err_no_msg()).
+# Export with snapshot() (dict) or prometheus_text()/write_prometheus() (Prometheus text format, e.g. for the node_exporter textfile collector).
+class MethodMetrics:
+    LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10, 30)
+    COMMAND_BUCKETS = (0, 1, 2, 3, 5, 8, 13, 21, 34, 55)
+    POLL_BUCKETS = (0, 1, 2, 3, 5, 10, 20, 50)
+
+    def __init__(self, prefix = "webdriver"):
+        self.prefix = prefix
+        self._lock = threading.Lock()
+        self._methods = {} # method name -> {"duration": Histogram, "commands": Histogram, "polls": Histogram, "success": int, "failure": int}
+
+    def record(self, method, seconds, commands, polls, success):
+        with self._lock:
+            stats = self._methods.get(method)
+            if stats is None:
+                stats = self._methods[method] = {
+                    "duration": Histogram(self.LATENCY_BUCKETS),
+                    "commands": Histogram(self.COMMAND_BUCKETS),
+                    "polls": Histogram(self.POLL_BUCKETS),
+                    "success": 0,
+                    "failure": 0,
+                }
+            stats["duration"].observe(seconds)
+            stats["commands"].observe(commands)
+            stats["polls"].observe(polls)
+            stats["success" if success else "failure"] += 1
+
+    # Dict of method name -> {"success", "failure", "duration", "commands", "polls"} (histograms as Histogram.snapshot())
+    def snapshot(self):
+        with self._lock:
+            return {
+                method: {
+                    "success": stats["success"],
+                    "failure": stats["failure"],
+                    **{name: stats[name].snapshot() for name in ("duration", "commands", "polls")},
+                }
+                for method, stats in sorted(self._methods.items())
+            }
+
+    def reset(self):
+        with self._lock: self._methods.clear()
+
+    def prometheus_text(self):
+        histograms = (
+            ("duration", "method_duration_seconds", "Wall time of WebdriverMain methods."),
+            ("commands", "method_commands", "WebDriver commands issued per WebdriverMain method call."),
+            ("polls", "method_wait_polls", "Element wait poll iterations per WebdriverMain method call."),
+        )
+        lines = []
+        with self._lock:
+            methods = sorted(self._methods.items())
+
+            name = f"{self.prefix}_method_calls_total"
+            lines += [f"# HELP {name} WebdriverMain method calls by outcome.", f"# TYPE {name} counter"]
+            for method, stats in methods:
+                for outcome in ("success", "failure"):
+                    lines.append(f'{name}{{method="{method}",outcome="{outcome}"}} {stats[outcome]}')
+
+            for key, metric, help_text in histograms:
+                name = f"{self.prefix}_{metric}"
+                lines += [f"# HELP {name} {help_text}", f"# TYPE {name} histogram"]
+                for method, stats in methods:
+                    histogram = stats[key]
+                    for upper_bound, count in histogram.cumulative():
+                        le = "+Inf" if upper_bound == float("inf") else repr(float(upper_bound))
+                        lines.append(f'{name}_bucket{{method="{method}",le="{le}"}} {count}')
+                    lines.append(f'{name}_sum{{method="{method}"}} {histogram.sum}')
+                    lines.append(f'{name}_count{{method="{method}"}} {histogram.count}')
+        return "\n".join(lines) + "\n"
+
+    # Writes prometheus_text() to path atomically (readers never see a partial file)
+    def write_prometheus(self, path):
+        tmp_path = f"{path}.{os.getpid()}.tmp"
+        with open(tmp_path, "w", encoding = "utf-8") as f: f.write(self.prometheus_text())
+        os.replace(tmp_path, path)
+
+# Decorator for WebdriverMain methods that talk to the driver.
+# Command counting (always on): attributes every WebDriver command issued during the call to the outermost decorated method
+# (e.g., find_click() counts the commands of its find_ele() and click_ele() calls). See WebdriverMain.command_stats().
+# Metrics (only if self.metrics is set): records every decorated call, nested ones included, in self.metrics (see MethodMetrics). When metrics are off, the only cost is one attribute check.
+def _instrumented(method):
+    name = method.__name__
+
+    @functools.wraps(method)
+    def wrapper(self, *args, **kwargs):
+        outermost = self._active_helper is None
+        if outermost:
+            self._active_helper = name
+            self.helper_calls[name] += 1
+
+        try:
+            if self.metrics is None: return method(self, *args, **kwargs)
+
+            commands, polls, errors = self._commands_issued, self._wait_polls, self.error_store.total
+            start = time.perf_counter()
+            success = False
+            try:
+                result = method(self, *args, **kwargs)
+                success = result is not False and self.error_store.total == errors
+                return result
+            finally:
+                self.metrics.record(name, time.perf_counter() - start, self._commands_issued - commands, self._wait_polls - polls, success)
+        finally:
+            if outermost: self._active_helper = None
+    return wrapper
 
 class WebdriverMain:
-    def __init__(self, window_x = 800, window_y = 600, suppress_notifications = False):
+    # driver_path: optional path to a chromedriver binary. If None, resolve_driver_path() finds one (env var, memo, on-disk cache, then ChromeDriverManager).
+    # interactive: if True, error messages wait for the user to press Enter (input()). Default (None) is True only when stdin is a terminal and the profile is not headless, so unattended runs never block.
+    # error_store: where errors are recorded. Default is a new ErrorStore() (bounded, in memory).
+    # profile: launch profile name from LAUNCH_PROFILES ("interactive", "headless-fast", "scrape") or a profile dict. Used by new_driver().
+    # metrics: optional MethodMetrics instance. Enables per-method latency/command/poll metrics. Can also be set (or set to None) later through self.metrics.
+    # wait_strategy: default element wait strategy, one of WAIT_STRATEGIES ("poll", "observe", "adaptive"). Can be overridden per call.
+    # executor_url: optional URL of an already running WebDriver server (chromedriver --port, Selenium Grid, benchmarks/fake_webdriver_server.py). new_driver() then connects to it instead of starting chromedriver.
+    # http_fast_path: optional HttpFastPath instance. Lets fetch_page() skip the browser for server-rendered pages. Can also be set (or set to None) later through self.http_fast_path.
+    # session_file: optional path of a session descriptor (see SESSION PERSISTENCE). At start-up, WebdriverMain reattaches to the browser it describes if that
+        # browser is still running, else launches a new one (and describes that one in session_file). close_out() ends the session and removes the file.
+    # profile_dir: optional Chrome user data directory, so cookies and logins survive new browsers. With a session_file, defaults to the persisted profile_dir,
+        # else "<session_file without extension>_profile".
+    # locator_cache: optional LocatorCache instance. Reuses elements found by find_ele() and the find_* composites while they stay attached. Can also be set (or set to None) later through self.locator_cache.
+    def __init__(self,
+            window_x = 800,
+            window_y = 600,
+            suppress_notifications = False,
+            driver_path = None,
+            interactive = None,
+            error_store = None,
+            profile = "interactive",
+            metrics = None,
+            executor_url = None,
+            wait_strategy = "poll",
+            locator_cache = None,
+            http_fast_path = None,
+            session_file = None,
+            profile_dir = None
+    ):
+        # Suppresses notifications if True. Set first: type checks and error reporting (including a failed start below) depend on it.
+        self.suppress_notifications = suppress_notifications
+
         self.check_types_to_raise_exc(
-            (window_x, window_y),
-            ((int, float), (int, float)),
-            ("window_x", "window_y"),
+            (window_x, window_y, driver_path, interactive, executor_url, session_file, profile_dir),
+            ((int, float), (int, float), (str, type(None)), (bool, type(None)), (str, type(None)), (str, type(None)), (str, type(None))),
+            ("window_x", "window_y", "driver_path", "interactive", "executor_url", "session_file", "profile_dir"),
         )
 
+        self.profile = resolve_launch_profile(profile) # Used to set up Chrome in new_driver().
+
+        if wait_strategy not in WAIT_STRATEGIES: raise InvalidWaitStrategy(wait_strategy)
+        self.wait_strategy = wait_strategy # Default for find_ele(), find_many() and the find_* composites
+        self._script_timeout = None # Script timeout (seconds) currently set on the driver. See _ensure_script_timeout().
+        self._blocking_applied = set() # Window handles that block_urls() has run in. Blocking is per tab, so switch_window() applies it to new ones.
+
+        # Whether display_err_msg() may block on input()
+        if interactive is None: interactive = self.profile["headless"] == False and sys.stdin is not None and sys.stdin.isatty()
+        self.interactive = interactive
+
         self.window_size = (window_x, window_y) # Used to size window in new_driver().
+        self.driver_path = driver_path # Used to start chromedriver in new_driver().
+        self.executor_url = executor_url # Used instead of starting chromedriver in new_driver().
 
-        # Error collection. Each error is a tuple with two elements: time stamp and the error itself (either a captured Exception or text passed to one of the error collecting methods).
-        self.error_col = []
+        # Session persistence (see SESSION PERSISTENCE)
+        self.session_file = session_file
+        if profile_dir is None and session_file is not None:
+            profile_dir = _read_json_file(session_file).get("profile_dir") or f"{os.path.splitext(session_file)[0]}_profile"
+        self.profile_dir = profile_dir # Used by chrome_options()
+        self._detached_executor = None # URL of the chromedriver this instance started with start_detached_chromedriver(), if any
+        self._session_persisted = False # Whether self.driver is saved to session_file (started or reattached) and hasn't been stopped since
 
-        # Starts a webdriver
-        self.new_driver()
+        # Handle of the driver's active window, tracked locally so that helpers don't have to ask the driver (one round trip per call).
+        # Updated by new_driver(), switch_window() and no_window_err(). None means unknown: the next switch_window() always switches.
+        self.curr_win_handle = None
 
-        # Suppresses notifications if True
-        self.suppress_notifications = suppress_notifications
+        # WebDriver commands issued per helper method, and number of calls per helper method. See command_stats().
+        self.command_counts = collections.Counter()
+        self.helper_calls = collections.Counter()
+        self._active_helper = None # Outermost helper currently running. Commands outside any helper are counted as "other".
+        self._commands_issued = 0 # Running totals of WebDriver commands and element wait polls for this instance. Used for metrics.
+        self._wait_polls = 0
+
+        # Per-method metrics (see MethodMetrics). None = off.
+        self.metrics = metrics
+
+        # Parsed pages returned by snapshot(). Replace with SnapshotCache(maxsize) to resize, or SnapshotCache(0) to turn caching off.
+        self.snapshot_cache = SnapshotCache()
+
+        # Found elements (see LocatorCache). None = off.
+        self.locator_cache = locator_cache
+
+        # HTTP fast path for fetch_page() (see HttpFastPath). None = always use the browser.
+        self.http_fast_path = http_fast_path
+
+        # Error collection. See ErrorStore.
+        self.error_store = ErrorStore() if error_store is None else error_store
+        # Most recent errors. Each error is a tuple with two elements: time stamp and the error itself (either a captured Exception or text passed to one of the error collecting methods).
+        self.error_col = self.error_store.errors
+
+        # Reattaches to the persisted session, or starts a webdriver
+        if self.session_file is None or self.reattach_session() == False: self.new_driver()
 
     # ----------------------------MAIN WEBDRIVER METHODS----------------------------
     # Attempts to reach provided url.
     # If fails, logs the error, informs user, recommends starting a new driver, and returns False.
+    @_instrumented
     def get_url(self, window_handle, url, fail_msg="Try restarting driver?\n\nPress Enter.\n"):
         if isinstance(url, str) == False and self.suppress_notifications == False: raise InvalidTypePassed("url", type(url), str)
 
-        # Switches windows if necessary
-        try:
-            if self.switch_window(self.driver.current_window_handle, window_handle) == False: return False
-        # This exception occurs if a window has been closed and cannot be found. No need to log this error.
-        except selenium.common.exceptions.NoSuchWindowException:
-            # Tries to switch to the first window in self.driver.window_handles list. If false, returns False.
-            if self.no_window_err() == False: return False
+        # Switches windows if necessary. Compares against the locally tracked handle (no round trip).
+        if self.switch_window(self.curr_win_handle, window_handle) == False: return False
+
+        # Elements of the page being left can't be reused
+        if self.locator_cache is not None: self.locator_cache.invalidate(window_handle)
+        # Cookies set by the HTTP fast path (see fetch_page())
+        if self.http_fast_path is not None: self._push_http_cookies()
 
         try:
             self.driver.get(url)
@@ -65,56 +1019,195 @@ class WebdriverMain:
     # Run at initialization. Can be run any other time as well.
     # Informs user of any errors (and logs).
     # Does not RE-start, only starts a new driver.
+    # The chromedriver binary is resolved once per process (see resolve_driver_path()), so restarts do not repeat version discovery.
+    # A persisted session (detached chromedriver or reattached browser) would outlive this process, so it is stopped first (see stop_driver()).
+    @_instrumented
     def new_driver(self):
+        if self._session_persisted: self.stop_driver()
         print("\nStarting new webdriver...")
+        self.curr_win_handle = None
+        if self.locator_cache is not None: self.locator_cache.clear()
 
-        try: self.driver = webdriver.Chrome(service = Service(ChromeDriverManager().install()))
+        try:
+            if self.executor_url is not None: self.driver = webdriver.Remote(command_executor = self.executor_url, options = self.chrome_options())
+            # A persisted session needs a chromedriver that outlives this process
+            elif self.session_file is not None:
+                self._detached_executor = start_detached_chromedriver(resolve_driver_path(self.driver_path))
+                self.driver = webdriver.Remote(command_executor = self._detached_executor, options = self.chrome_options())
+            else: self.driver = webdriver.Chrome(service = Service(resolve_driver_path(self.driver_path)), options = self.chrome_options())
         except Exception as new_driver_e:
+            self._end_session()
             self.display_err_msg(
                 new_driver_e,
                 "\nFailed to start a new driver. Try closing and reopening the program.\n\nPress Enter.\n"
             )
             return False
         else:
+            self._count_commands()
             self.driver.set_window_size(self.window_size[0], self.window_size[1])
             self.main_win_handle = self.driver.current_window_handle
+            self.curr_win_handle = self.main_win_handle
+            self._script_timeout = 30 # W3C default
+            self._blocking_applied = {self.main_win_handle}
+            self.block_urls()
+            if self.session_file is not None:
+                self._session_persisted = True
+                self._write_session([self.main_win_handle])
+
+    # Builds Chrome options from self.profile (see LAUNCH_PROFILES)
+    def chrome_options(self):
+        options = webdriver.ChromeOptions()
+        options.page_load_strategy = self.profile["page_load_strategy"]
+        if self.profile["headless"]: options.add_argument("--headless=new")
+        if self.profile["disable_extensions"]: options.add_argument("--disable-extensions")
+        if self.profile["disable_images"]: options.add_experimental_option("prefs", {"profile.managed_default_content_settings.images": 2})
+        for argument in self.profile["arguments"]: options.add_argument(argument)
+        if self.profile_dir is not None: options.add_argument(f"--user-data-dir={os.path.abspath(self.profile_dir)}")
+        return options
+
+    # Blocks the URL patterns of self.profile (blocked_resource_types and blocked_url_patterns) through the Chrome DevTools Protocol.
+    # Applies to the driver's current tab only: new_driver() runs it for the main window and switch_window() for each window it enters for the first time.
+    # A window that is never switched to loads unblocked. Failure is logged quietly: pages still load, just slower.
+    def block_urls(self):
+        patterns = [pattern for resource_type in self.profile["blocked_resource_types"] for pattern in RESOURCE_TYPE_PATTERNS[resource_type]]
+        patterns += self.profile["blocked_url_patterns"]
+        if patterns == []: return
+
+        try:
+            self.driver.execute_cdp_cmd("Network.enable", {})
+            self.driver.execute_cdp_cmd("Network.setBlockedURLs", {"urls": patterns})
+        except Exception as block_urls_e:
+            self.log_err_no_msg(block_urls_e)
+            return False
 
     # Stops the driver. Quietly logs any error. Does not start new driver.
+    @_instrumented
     def stop_driver(self):
         try: self.driver.quit()
         except Exception as stop_driver_e:
             self.log_err_no_msg(stop_driver_e)
             return False
+        finally: self._end_session()
 
     # Restarts driver. Attempts to close current driver and open a new one.
+    # A driver that has already died is quietly logged (see stop_driver()) so that a new one can still be started.
+    @_instrumented
     def restart_driver(self):
-        self.driver.quit()
-        self.new_driver()
+        self.stop_driver()
+        return self.new_driver()
 
     # If desired window handle is not the current window, attempts to switch
     # Failure will inform the user, log the error, and return False.
     # Does not affect self.main_win_handle
+    # Pass self.curr_win_handle as curr_window_handle to avoid asking the driver for its current window. curr_window_handle may be None (unknown), which always switches.
+    @_instrumented
     def switch_window(self, curr_window_handle, new_window_handle):
         self.check_types_to_raise_exc(
             (curr_window_handle, new_window_handle),
-            (str, str),
+            ((str, type(None)), str),
             ("curr_window_handle", "new_window_handle")
         )
 
         # If the user's active window is the window they're trying to switch to, no action taken
         if curr_window_handle == new_window_handle: return
 
+        # The new window's page may have changed since its elements were cached
+        if self.locator_cache is not None: self.locator_cache.invalidate(new_window_handle)
+
         try:
             self.driver.switch_to.window(new_window_handle)
         except Exception as win_switch_e:
             self.display_err_msg(win_switch_e, f"\nFailed to switch to handle {new_window_handle}.\n\nPress Enter.\n")
             return False
 
-    # Easy way to close everything out.
+        self.curr_win_handle = new_window_handle
+        if new_window_handle not in self._blocking_applied:
+            self._blocking_applied.add(new_window_handle)
+            self.block_urls()
+
+    # Re-reads the driver's active window into self.curr_win_handle (one round trip).
+    # Only needed after switching windows through self.driver directly instead of switch_window().
+    # A closed active window falls back to no_window_err().
+    @_instrumented
+    def sync_window_handle(self):
+        try: self.curr_win_handle = self.driver.current_window_handle
+        except selenium.common.exceptions.NoSuchWindowException:
+            return self.no_window_err()
+
+    # Easy way to close everything out. Also flushes the error store's file (if any).
+    @_instrumented
     def close_out(self):
         try: self.driver.quit()
         except Exception as close_out_e:
             self.display_err_msg(close_out_e, "Failed to close out webdriver. Try closing manually.")
+        self._end_session()
+        self.error_store.close()
+
+    # ----------------------------SESSION PERSISTENCE METHODS----------------------------
+    # Reattaches to the session described in self.session_file, if its browser still answers. Run at initialization when session_file is given.
+    # Costs one round trip instead of a browser launch. The persisted main_win_handle is kept if that window still exists, else the first window becomes main.
+    # Returns True on success. Failure (no file, or the session is gone) is logged quietly and returns False; the caller then starts a new driver.
+    @_instrumented
+    def reattach_session(self):
+        descriptor = _read_json_file(self.session_file)
+        if descriptor.get("executor_url") is None or descriptor.get("session_id") is None: return False
+
+        print("\nReattaching to webdriver session...")
+        try:
+            driver = _AttachedRemote(descriptor["executor_url"], descriptor["session_id"], descriptor.get("capabilities") or {}, self.chrome_options())
+            window_handles = driver.window_handles # Liveness check
+            if window_handles == []: raise selenium.common.exceptions.NoSuchWindowException("The persisted session has no windows left")
+        except Exception as reattach_e:
+            self.log_err_no_msg(reattach_e)
+            # The browser is gone. A chromedriver we started would otherwise linger.
+            if descriptor.get("detached"): _shutdown_chromedriver(descriptor["executor_url"])
+            return False
+
+        self.driver = driver
+        self._session_persisted = True
+        self._count_commands()
+        self._detached_executor = descriptor["executor_url"] if descriptor.get("detached") else None
+        self.main_win_handle = descriptor.get("main_win_handle") if descriptor.get("main_win_handle") in window_handles else window_handles[0]
+        self.curr_win_handle = None # The browser's active window is whatever the previous process left it on
+        self._script_timeout = None # Unknown. _ensure_script_timeout() sets it when needed.
+        self._blocking_applied = set() # Unknown as well. switch_window() re-applies it (setting the same patterns again is harmless).
+        if self.locator_cache is not None: self.locator_cache.clear()
+        self._write_session(window_handles)
+        return True
+
+    # Writes the session descriptor to self.session_file (one round trip, for the window handles). new_driver() and reattach_session() save automatically;
+    # call this after opening windows so that their handles are persisted too.
+    @_instrumented
+    def save_session(self):
+        if self.session_file is None: return False
+        try: window_handles = self.driver.window_handles
+        except Exception as save_session_e:
+            self.log_err_no_msg(save_session_e)
+            return False
+        self._write_session(window_handles)
+
+    def _write_session(self, window_handles):
+        _write_json_file(self.session_file, {
+            "executor_url": self._detached_executor or self.executor_url,
+            "session_id": self.driver.session_id,
+            "capabilities": self.driver.caps,
+            "window_handles": window_handles,
+            "main_win_handle": self.main_win_handle,
+            "detached": self._detached_executor is not None,
+            "profile_dir": self.profile_dir,
+            "saved_at": datetime.datetime.now().isoformat(timespec = "seconds"),
+        })
+
+    # Called once the browser is quit (or failed to start): shuts down a chromedriver started by this instance and removes the session descriptor,
+    # since there is nothing left to reattach to.
+    def _end_session(self):
+        self._session_persisted = False
+        if self._detached_executor is not None:
+            _shutdown_chromedriver(self._detached_executor)
+            self._detached_executor = None
+        if self.session_file is not None:
+            try: os.remove(self.session_file)
+            except OSError: pass
 
     # ----------------------------WORKING WITH ELEMENTS METHODS----------------------------
     # All the methods in this section work with elements (search, click, etc.)
@@ -128,35 +1221,56 @@ class WebdriverMain:
         # search_by: Determines the By method (selenium.webdriver.common.by) that will be used (accepted arguments: "id", "name", "xpath", "link_text", "partial_link_text", "tag_name", "class_name", "css_selector")
         # search_for: the string to search for
         # fail_msg: custom message to user upon a failure (see above comments)
-        # wait_time: optional parameter. The amount of time in seconds to wait (for WebDriverWait). Default = 5.
+        # wait_time: optional parameter. The amount of time in seconds to wait (with any wait strategy). Default = 5.
+        # multiple: optional parameter. If True, returns a list of all matching elements (once at least one is found).
+        # wait_strategy: optional parameter. How to wait, one of WAIT_STRATEGIES. Default = self.wait_strategy.
     # Success returns the found webdriver object. Failure returns False.
+    @_instrumented
     def find_ele(self,
             window_handle,
             search_by,
             search_for,
             fail_msg,
             wait_time = 5,
-            multiple = False
+            multiple = False,
+            wait_strategy = None
     ):
         self.check_types_to_raise_exc(
             (window_handle, search_by, search_for, wait_time, fail_msg),
             (str, str, str, (float, int), str),
             ("window_handle", "search_by", "search_for", "wait_time", "fail_msg")
         )
+        if wait_strategy is None: wait_strategy = self.wait_strategy
+        if wait_strategy not in WAIT_STRATEGIES: raise InvalidWaitStrategy(wait_strategy)
 
         if search_for == "": return False
 
-        # Switches windows if necessary
-        try:
-            if self.switch_window(self.driver.current_window_handle, window_handle) == False: return False
-        # This exception occurs if a window has been closed and cannot be found. No need to log this error.
-        except selenium.common.exceptions.NoSuchWindowException:
-            # Tries to switch to the first window in self.driver.window_handles list. If false, returns False.
-            if self.no_window_err() == False: return False
+        # Switches windows if necessary. Compares against the locally tracked handle (no round trip).
+        if self.switch_window(self.curr_win_handle, window_handle) == False: return False
+
+        # Reuses a cached element if it is still attached (see LocatorCache)
+        cache_key = (window_handle, search_by, search_for)
+        if self.locator_cache is not None and multiple == False:
+            element = self._cached_element(cache_key, lambda element: element.tag_name)
+            if element is not None: return element
+
+        # "observe" and "adaptive" wait in the browser-side locator (LOCATE_SCRIPT vocabulary). Multiple elements come back from the same round trip.
+        if wait_strategy != "poll":
+            if search_by not in SEARCH_BY_OPTIONS: raise InvalidSearchForElement(search_by)
+            try: found = self._wait_for_locators([["element", search_by, search_for, multiple]], ["element"], wait_time, wait_strategy)
+            except Exception as search_for_id_e:
+                self.display_err_msg(
+                    search_for_id_e,
+                    f"\nFailed to find {fail_msg}\n\nPress Enter to continue.\n"
+                )
+                return False
+            if self.locator_cache is not None and multiple == False: self.locator_cache.put(cache_key, found["element"])
+            return found["element"]
 
         # Sets up proper type object to use for search below based on search_by argument
         match search_by:
             case "id": search_by = By.ID
+            case "name": search_by = By.NAME
             case "xpath": search_by = By.XPATH
             case "link_text": search_by = By.LINK_TEXT
             case "partial_link_text": search_by = By.PARTIAL_LINK_TEXT
@@ -169,7 +1283,7 @@ class WebdriverMain:
         try:
             element = WebDriverWait(self.driver, wait_time).\
                 until(
-                EC.presence_of_element_located((search_by, search_for))
+                self._counts_polls(EC.presence_of_element_located((search_by, search_for)))
                 )
         except Exception as search_for_id_e:
             self.display_err_msg(
@@ -179,7 +1293,9 @@ class WebdriverMain:
             return False
 
         # If only looking for one element, returns it
-        if multiple == False: return element
+        if multiple == False:
+            if self.locator_cache is not None: self.locator_cache.put(cache_key, element)
+            return element
 
         # If looking for multiple elements, returns a list of all found elements
         try: elements = self.driver.find_elements(search_by, search_for)
@@ -190,8 +1306,131 @@ class WebdriverMain:
             )
             return False
 
+        return elements
+
+    # Searching for many elements at once
+    # Resolves every selector in one execute_script call per poll instead of one WebDriverWait per selector, so a 20 field form costs one wait instead of 20.
+    # Arguments:
+        # window_handle: handle of window to search within. The driver's active window will remain this window at the end of the method.
+        # selectors: dict of name -> (search_by, search_for) or (search_by, search_for, multiple). search_by accepts the same values as find_ele(). multiple = True returns a list of all matches for that name.
+        # fail_msg: custom message to user upon a failure (the names of the selectors that were not found are added to it)
+        # wait_time: optional parameter. The amount of time in seconds to wait for the required selectors. Default = 5.
+        # required: optional iterable of names that must be found before returning. Default = all names.
+        # wait_strategy: optional parameter. How to wait, one of WAIT_STRATEGIES. Default = self.wait_strategy.
+    # Success returns a dict of name -> found webdriver object (or list of objects if multiple). Names that are not required and were not found map to False.
+    # Failure (a required name was not found within wait_time) returns False.
+    @_instrumented
+    def find_many(self,
+            window_handle,
+            selectors,
+            fail_msg,
+            wait_time = 5,
+            required = None,
+            wait_strategy = None
+    ):
+        self.check_types_to_raise_exc(
+            (window_handle, selectors, fail_msg, wait_time),
+            (str, dict, str, (float, int)),
+            ("window_handle", "selectors", "fail_msg", "wait_time")
+        )
+        if wait_strategy is None: wait_strategy = self.wait_strategy
+        if wait_strategy not in WAIT_STRATEGIES: raise InvalidWaitStrategy(wait_strategy)
+
+        queries = []
+        for name, selector in selectors.items():
+            if isinstance(selector, (list, tuple)) == False or len(selector) not in (2, 3): raise InvalidTypePassed(f"selectors[{name!r}]", type(selector), "(search_by, search_for[, multiple])")
+            self.check_types_to_raise_exc(
+                (name, selector[0], selector[1]),
+                (str, str, str),
+                ("name", "search_by", "search_for")
+            )
+            if selector[0] not in SEARCH_BY_OPTIONS: raise InvalidSearchForElement(selector[0])
+            queries.append([name, selector[0], selector[1], bool(selector[2]) if len(selector) == 3 else False])
+
+        required = set(selectors) if required is None else set(required)
+        if required - set(selectors): raise InvalidTypePassed("required", "names not in selectors", "names that are keys of selectors")
+
+        # Switches windows if necessary. Compares against the locally tracked handle (no round trip).
+        if self.switch_window(self.curr_win_handle, window_handle) == False: return False
+
+        # Most recent poll result. Kept outside the wait so that the missing names can be reported on timeout.
+        last_found = {}
+
+        try: found = self._wait_for_locators(queries, sorted(required), wait_time, wait_strategy, last_found)
+        except Exception as find_many_e:
+            missing = ", ".join(sorted(name for name in required if last_found.get(name) in (None, [])))
+            self.display_err_msg(
+                find_many_e,
+                f"\nFailed to find {fail_msg} ({missing})\n\nPress Enter to continue.\n"
+            )
+            return False
+
+        return {name: False if found.get(name) in (None, []) else found[name] for name in selectors}
+
+    # Wait engine behind find_many() and find_ele() (except find_ele()'s "poll" strategy, which uses Selenium's own locators).
+    # Waits, with the given strategy (see WAIT_STRATEGIES), until every name in required is found by queries ([name, search_by, search_for, multiple] lists).
+    # Returns the locateAll() result (see _LOCATE_FUNCTIONS). Raises TimeoutException after wait_time seconds.
+    # last_found (optional dict) receives the most recent result, for reporting what is missing.
+    def _wait_for_locators(self, queries, required, wait_time, wait_strategy, last_found = None):
+        if last_found is None: last_found = {}
+
+        # One round trip. Returns the result once all required names are found, else False.
+        def all_required_found(driver):
+            last_found.clear()
+            last_found.update(driver.execute_script(LOCATE_SCRIPT, queries) or {})
+            if any(last_found.get(name) in (None, []) for name in required): return False
+            return dict(last_found)
+
+        # Without scripts: one find_elements round trip per query
+        def all_required_found_natively(driver):
+            last_found.clear()
+            for name, search_by, search_for, multiple in queries:
+                found = [] if search_for == "" else driver.find_elements(_SEARCH_BY_LOCATORS[search_by], search_for)
+                last_found[name] = found if multiple else (found[0] if found else None)
+            if any(last_found.get(name) in (None, []) for name in required): return False
+            return dict(last_found)
+
+        if wait_strategy == "poll": return WebDriverWait(self.driver, wait_time).until(self._counts_polls(all_required_found))
+
+        deadline = time.monotonic() + wait_time
+        timeout_message = f"Timed out after {wait_time} seconds waiting for {', '.join(required)}."
+
+        poll = all_required_found
+        if wait_strategy == "observe":
+            # The browser answers once wait_time runs out. The script timeout is only a backstop.
+            self._ensure_script_timeout(wait_time + 5)
+            self._wait_polls += 1
+            try: answer = self.driver.execute_async_script(OBSERVE_SCRIPT, queries, required, int(wait_time * 1000))
+            # Scripts can't run here, or the page navigated away mid-wait. Polls natively for the rest of wait_time instead
+            # (LOCATE_SCRIPT would fail the same way if scripts are blocked).
+            except selenium.common.exceptions.JavascriptException:
+                poll = all_required_found_natively
+            else:
+                last_found.update(answer["found"] or {})
+                if answer["complete"] == False: raise selenium.common.exceptions.TimeoutException(timeout_message)
+                return answer["found"]
+
+        # Adaptive polling: quick first re-checks, backing off to ADAPTIVE_POLL_MAX
+        interval = ADAPTIVE_POLL_START
+        while True:
+            self._wait_polls += 1
+            found = poll(self.driver)
+            if found != False: return found
+
+            remaining = deadline - time.monotonic()
+            if remaining <= 0: raise selenium.common.exceptions.TimeoutException(timeout_message)
+            time.sleep(min(interval, remaining))
+            interval = min(interval * 2, ADAPTIVE_POLL_MAX)
+
+    # Raises the driver's script timeout (execute_async_script) to at least seconds. Only costs a round trip when it has to grow.
+    def _ensure_script_timeout(self, seconds):
+        if self._script_timeout is not None and self._script_timeout >= seconds: return
+        self.driver.set_script_timeout(seconds)
+        self._script_timeout = seconds
+
     # Attempts to click an element.
     # Parameter webd_ele is a webdriver object. Ideally use self.find_ele() to obtain the webdriver object and then pass that in.
+    @_instrumented
     def click_ele(self, window_handle, webd_ele, fail_msg):
         self.check_types_to_raise_exc(
             (window_handle, webd_ele, fail_msg),
@@ -199,13 +1438,8 @@ class WebdriverMain:
             ("window_handle", "webd_ele", "fail_msg")
         )
 
-        # Switches windows if necessary
-        try:
-            if self.switch_window(self.driver.current_window_handle, window_handle) == False: return False
-        # This exception occurs if a window has been closed and cannot be found. No need to log this error.
-        except selenium.common.exceptions.NoSuchWindowException:
-            # Tries to switch to the first window in self.driver.window_handles list. If false, returns False.
-            if self.no_window_err() == False: return False
+        # Switches windows if necessary. Compares against the locally tracked handle (no round trip).
+        if self.switch_window(self.curr_win_handle, window_handle) == False: return False
 
         try: webd_ele.click()
         except Exception as click_e:
@@ -214,6 +1448,7 @@ class WebdriverMain:
 
     # Attempts to enter text into an element
     # Paremeter webd_ele is a webdriver element.
+    @_instrumented
     def enter_text_ele(self,
             window_handle,
             webd_ele,
@@ -226,13 +1461,8 @@ class WebdriverMain:
             ("window_handle", "webd_ele", "text_to_enter", "fail_msg")
         )
 
-        # Switches windows if necessary
-        try:
-            if self.switch_window(self.driver.current_window_handle, window_handle) == False: return False
-        # This exception occurs if a window has been closed and cannot be found. No need to log this error.
-        except selenium.common.exceptions.NoSuchWindowException:
-            # Tries to switch to the first window in self.driver.window_handles list. If false, returns False.
-            if self.no_window_err() == False: return False
+        # Switches windows if necessary. Compares against the locally tracked handle (no round trip).
+        if self.switch_window(self.curr_win_handle, window_handle) == False: return False
 
         try: webd_ele.send_keys(text_to_enter)
         except Exception as enter_text_e:
@@ -241,6 +1471,7 @@ class WebdriverMain:
 
     # Attempts to press Enter on an element
     # Paremeter webd_ele is a webdriver element.
+    @_instrumented
     def press_enter_ele(self,
         window_handle,
         webd_ele,
@@ -252,13 +1483,8 @@ class WebdriverMain:
             ("window_handle", "webd_ele", "fail_msg")
         )
 
-        # Switches windows if necessary
-        try:
-            if self.switch_window(self.driver.current_window_handle, window_handle) == False: return False
-        # This exception occurs if a window has been closed and cannot be found. No need to log this error.
-        except selenium.common.exceptions.NoSuchWindowException:
-            # Tries to switch to the first window in self.driver.window_handles list. If false, returns False.
-            if self.no_window_err() == False: return False
+        # Switches windows if necessary. Compares against the locally tracked handle (no round trip).
+        if self.switch_window(self.curr_win_handle, window_handle) == False: return False
 
         try: webd_ele.send_keys(Keys.ENTER)
         except Exception as press_enter_e:
@@ -266,38 +1492,52 @@ class WebdriverMain:
             return False
 
     # One method to find an element and then click it
+    @_instrumented
     def find_click(self,
        window_handle,
        search_by,
        search_for,
        fail_msg,
-       wait_time = 5
+       wait_time = 5,
+       wait_strategy = None
     ):
+        if self._act_on_cached(window_handle, search_by, search_for, lambda element: element.click(), f"\nFailed to click {fail_msg}\n\nPress Enter") is not None: return
+
         found_ele = self.find_ele(
             window_handle,
             search_by,
             search_for,
             fail_msg,
-            wait_time = wait_time
+            wait_time = wait_time,
+            wait_strategy = wait_strategy
         )
         if found_ele == False: return # If not found, doesn't try to click.
         self.click_ele(window_handle, found_ele, fail_msg)
 
     # One method to find an element and enter text into it
+    @_instrumented
     def find_enter_text(self,
             window_handle,
             search_by,
             search_for,
             text_to_enter,
             fail_msg,
-            wait_time = 5
+            wait_time = 5,
+            wait_strategy = None
     ):
+        if self._act_on_cached(
+                window_handle, search_by, search_for,
+                lambda element: element.send_keys(text_to_enter),
+                f"Failed to enter text into {fail_msg}\n\nPress Enter to continue.\n"
+        ) is not None: return
+
         found_ele = self.find_ele(
             window_handle,
             search_by,
             search_for,
             fail_msg,
-            wait_time = wait_time
+            wait_time = wait_time,
+            wait_strategy = wait_strategy
         )
         if found_ele == False: return # If not found, doesn't try to enter text.
         self.enter_text_ele(
@@ -308,20 +1548,30 @@ class WebdriverMain:
         )
 
     # One method to find an element, enter text, and then press Enter
+    @_instrumented
     def find_enter_text_enter(self,
             window_handle,
             search_by,
             search_for,
             text_to_enter,
             fail_msg,
-            wait_time = 5
+            wait_time = 5,
+            wait_strategy = None
     ):
+        # Text and Enter go out as one command on the cached path
+        if self._act_on_cached(
+                window_handle, search_by, search_for,
+                lambda element: element.send_keys(text_to_enter + Keys.ENTER),
+                f"Failed to enter text into {fail_msg}\n\nPress Enter to continue.\n"
+        ) is not None: return
+
         found_ele = self.find_ele(
             window_handle,
             search_by,
             search_for,
             fail_msg,
-            wait_time = wait_time
+            wait_time = wait_time,
+            wait_strategy = wait_strategy
         )
         if found_ele == False: return # If not found, doesn't try to enter text.
         # If enter text fails, doesn't try to press Enter.
@@ -333,33 +1583,313 @@ class WebdriverMain:
         ) == False: return
         self.press_enter_ele(window_handle, found_ele, fail_msg)
 
+    # Looks up key in self.locator_cache and runs check(element) (one command). Returns the element, or None on a miss.
+    # A stale element (or any other failing check, e.g. a window that has since closed) is a miss.
+    def _cached_element(self, key, check):
+        element = self.locator_cache.get(key)
+        if element is None: return None
+        try: check(element)
+        except Exception:
+            self.locator_cache.discard_stale(key)
+            return None
+        return element
+
+    # Cached path of the find_* composites: runs action(element) on the cached element for this locator, without an attached check.
+    # Returns None on a miss (off, not cached, or stale: the composite then finds the element as usual), True on success, False on failure
+    # (a failed window switch, or an action error reported with fail_msg like the element helpers do).
+    def _act_on_cached(self, window_handle, search_by, search_for, action, fail_msg):
+        if self.locator_cache is None or isinstance(window_handle, str) == False: return None
+        if self.switch_window(self.curr_win_handle, window_handle) == False: return False
+
+        # Not counted here: on a miss, the composite's find_ele() counts the lookup
+        key = (window_handle, search_by, search_for)
+        element = self.locator_cache.get(key, count = False)
+        if element is None: return None
+        try: action(element)
+        except selenium.common.exceptions.StaleElementReferenceException:
+            self.locator_cache.discard_stale(key, counted = False)
+            return None
+        except Exception as cached_action_e:
+            self.display_err_msg(cached_action_e, fail_msg)
+            return False
+        self.locator_cache.count_hit()
+        return True
+
+    # ----------------------------STEP PIPELINE METHODS----------------------------
+    # Runs a multi-action flow (see STEP_ACTIONS for the steps) with as few round trips as possible:
+        # Element steps are batched (see _compile_steps()). All elements of a batch are located with one wait (one execute_script per poll, like find_many()).
+        # A type step followed by press_enter on the same element is sent as one send_keys (text + Enter).
+        # merge_actions = True sends all typing/clicking of a batch as one W3C Actions chain (one round trip). Actions click with the pointer,
+        # so the elements must be visible in the viewport; a failing chain is reported with the fail_msg of its first typing/clicking step.
+        # A press_enter step that doesn't follow typing into the same element is sent on its own, between chains.
+    # Stops at the first failing step, reporting that step's fail_msg, and returns False.
+    # Success returns a list with one entry per step: the webdriver object the step worked on, or None for navigate steps.
+    # Example (login):
+        # webd.run_steps(webd.main_win_handle, [
+            # ("navigate", "https://example.com/login", "login page"),
+            # ("type", "id", "username", "me", "username box"),
+            # ("type", "id", "password", "secret", "password box"),
+            # ("press_enter", "id", "password", "password box"),
+            # ("wait_for", "id", "account-menu", "account menu"),
+        # ])
+    @_instrumented
+    def run_steps(self,
+            window_handle,
+            steps,
+            wait_time = 5,
+            wait_strategy = None,
+            merge_actions = False
+    ):
+        self.check_types_to_raise_exc(
+            (window_handle, steps, wait_time, merge_actions),
+            (str, (list, tuple), (float, int), bool),
+            ("window_handle", "steps", "wait_time", "merge_actions")
+        )
+        if wait_strategy is None: wait_strategy = self.wait_strategy
+        if wait_strategy not in WAIT_STRATEGIES: raise InvalidWaitStrategy(wait_strategy)
+
+        for step in steps:
+            if isinstance(step, (list, tuple)) == False or len(step) == 0 or step[0] not in STEP_ACTIONS or len(step) != STEP_ACTIONS[step[0]] + 1: raise InvalidStep(step)
+            for argument in step:
+                if isinstance(argument, str) == False and self.suppress_notifications == False: raise InvalidTypePassed(f"step {step}", type(argument), str)
+            if step[0] != "navigate" and step[1] not in SEARCH_BY_OPTIONS: raise InvalidSearchForElement(step[1])
+
+        results = [None] * len(steps)
+        for batch in _compile_steps(steps):
+            if steps[batch[0]][0] == "navigate":
+                if self.get_url(window_handle, steps[batch[0]][1], steps[batch[0]][2]) == False: return False
+            elif self._run_step_batch(window_handle, steps, batch, results, wait_time, wait_strategy, merge_actions) == False:
+                return False
+        return results
+
+    # Locates and acts on one batch of element steps for run_steps(). Stores found elements in results. Failure returns False.
+    def _run_step_batch(self, window_handle, steps, batch, results, wait_time, wait_strategy, merge_actions):
+        # Switches windows if necessary. Compares against the locally tracked handle (no round trip).
+        if self.switch_window(self.curr_win_handle, window_handle) == False: return False
+
+        # One query per distinct locator
+        names = {}
+        queries = []
+        for index in batch:
+            locator = tuple(steps[index][1:3])
+            if locator not in names:
+                names[locator] = f"step{index}"
+                queries.append([names[locator], locator[0], locator[1], False])
+
+        last_found = {}
+        try: found = self._wait_for_locators(queries, [query[0] for query in queries], wait_time, wait_strategy, last_found)
+        except Exception as run_steps_e:
+            failed = next((index for index in batch if last_found.get(names[tuple(steps[index][1:3])]) is None), batch[0])
+            self.display_err_msg(
+                run_steps_e,
+                f"\nFailed to find {steps[failed][-1]}\n\nPress Enter to continue.\n"
+            )
+            return False
+
+        for index in batch: results[index] = found[names[tuple(steps[index][1:3])]]
+
+        # Typing/clicking, with type + press_enter on the same element merged: list of (step index, action, element, keys)
+        interactions = []
+        for index in batch:
+            action, element = steps[index][0], results[index]
+            if action == "type": interactions.append((index, "type", element, steps[index][3]))
+            elif action == "click": interactions.append((index, "click", element, None))
+            elif action == "press_enter":
+                if interactions and interactions[-1][1] == "type" and interactions[-1][2] == element:
+                    interactions[-1] = interactions[-1][:3] + (interactions[-1][3] + Keys.ENTER,)
+                else: interactions.append((index, "press_enter", element, None))
+        if interactions == []: return
+
+        if merge_actions: return self._perform_merged(window_handle, steps, interactions)
+
+        for index, action, element, keys in interactions:
+            if action == "click": succeeded = self.click_ele(window_handle, element, steps[index][-1])
+            elif action == "press_enter": succeeded = self.press_enter_ele(window_handle, element, steps[index][-1])
+            else: succeeded = self.enter_text_ele(window_handle, element, keys, steps[index][-1])
+            if succeeded == False: return False
+
+    # merge_actions part of _run_step_batch(): sends the interactions as W3C Actions chains. Typing focuses its element with a pointer click, then moves the
+    # caret to the end of the value (End), as send_keys() would. A standalone press_enter is not clicked, so that a button or link isn't activated twice:
+    # it ends the chain and goes through press_enter_ele().
+    def _perform_merged(self, window_handle, steps, interactions):
+        chain, first = None, None # Chain being built, and the step index of its first interaction
+        for index, action, element, keys in interactions:
+            if action == "press_enter":
+                if chain is not None and self._perform_chain(chain, steps[first][-1]) == False: return False
+                chain = None
+                if self.press_enter_ele(window_handle, element, steps[index][-1]) == False: return False
+                continue
+
+            if chain is None: chain, first = ActionChains(self.driver), index
+            chain.click(element)
+            if action == "type": chain.send_keys(Keys.END + keys)
+
+        if chain is not None: return self._perform_chain(chain, steps[first][-1])
+
+    def _perform_chain(self, chain, fail_msg):
+        try: chain.perform()
+        except Exception as run_steps_e:
+            self.display_err_msg(run_steps_e, f"\nFailed to interact with {fail_msg}\n\nPress Enter to continue.\n")
+            return False
+
+    # ----------------------------PAGE SNAPSHOT METHODS----------------------------
+    # Fetches the page source of window_handle in one round trip and returns it as a PageSnapshot, for answering many CSS/XPath queries locally.
+    # Much faster than one find_ele() per field for read-heavy scraping. Snapshots are a copy: they don't see later changes to the page, and their elements can't be clicked.
+    # Unchanged pages come from self.snapshot_cache (already parsed).
+    # Failure returns False.
+    @_instrumented
+    def snapshot(self, window_handle, fail_msg = "page"):
+        self.check_types_to_raise_exc(
+            (window_handle, fail_msg),
+            (str, str),
+            ("window_handle", "fail_msg")
+        )
+
+        # Switches windows if necessary. Compares against the locally tracked handle (no round trip).
+        if self.switch_window(self.curr_win_handle, window_handle) == False: return False
+
+        try: html = self.driver.page_source
+        except Exception as snapshot_e:
+            self.display_err_msg(snapshot_e, f"\nFailed to read {fail_msg}\n\nPress Enter to continue.\n")
+            return False
+
+        return self.snapshot_cache.get(window_handle, html)
+
+    # Returns url's page as a PageSnapshot, over HTTP when self.http_fast_path allows it, else by navigating window_handle (get_url() + snapshot()).
+    # The HTTP path does not touch the browser window (the window stays on its current page), so use it for reading pages, not for pages you then click through.
+    # Cookies are shared both ways (see _sync_http_cookies()): the HTTP session sends the driver's cookies, and cookies set over HTTP are copied to the driver
+    # before its next get_url() navigation.
+    # An HTTP error (connection, timeout) falls back to the browser and is logged quietly, and so does a response that isn't HTML, on every route.
+    # Failure of the browser path returns False.
+    @_instrumented
+    def fetch_page(self, window_handle, url, fail_msg = "Try restarting driver?\n\nPress Enter.\n"):
+        self.check_types_to_raise_exc(
+            (window_handle, url, fail_msg),
+            (str, str, str),
+            ("window_handle", "url", "fail_msg")
+        )
+
+        fast_path = self.http_fast_path
+        route = "browser" if fast_path is None else fast_path.route(url)
+        if route != "browser":
+            try:
+                self._sync_http_cookies()
+                response = fast_path.get(url)
+            except Exception as fetch_page_e:
+                self.log_err_no_msg(fetch_page_e)
+                response = None
+
+            if response is not None and ((route == "http" and _is_html_response(response)) or fast_path.needs_browser(response) == False):
+                fast_path.count("http")
+                return self.snapshot_cache.get(None, response.text)
+            fast_path.count("fallbacks")
+
+        if fast_path is not None: fast_path.count("browser")
+        if self.get_url(window_handle, url, fail_msg) == False: return False
+        return self.snapshot(window_handle, f"page {url}")
+
+    # Copies the driver's cookies (and, once, its User-Agent) into self.http_fast_path's session.
+    # Only asks the driver (one round trip) if WebDriver commands were issued since the last copy: without commands, the browser's cookies can only
+    # change through scripts running in its pages. Gets all of the browser's cookies through the Chrome DevTools Protocol, else those of the window's current page.
+    def _sync_http_cookies(self):
+        fast_path = self.http_fast_path
+        if fast_path.copy_user_agent:
+            fast_path.copy_user_agent = False
+            user_agent = self.driver.execute_script("return navigator.userAgent;")
+            if isinstance(user_agent, str) and user_agent: fast_path.session.headers["User-Agent"] = user_agent
+
+        if fast_path.synced_at == (id(self.driver), self._commands_issued): return
+        try: cookies = self.driver.execute_cdp_cmd("Network.getAllCookies", {}).get("cookies")
+        except Exception: cookies = None
+        if cookies is None: cookies = self.driver.get_cookies()
+        fast_path.load_cookies(cookies)
+        fast_path.synced_at = (id(self.driver), self._commands_issued)
+
+    # Copies cookies set over HTTP since the last call to the driver. Called by get_url() before navigating.
+    # Uses the Chrome DevTools Protocol when available (any domain), else WebDriver's add_cookie() (only accepted for the current page's domain; others are logged quietly).
+    # Both keep the cookie's httpOnly and sameSite flags, which share their names in the two formats.
+    # Host-only cookies stay host-only: Network.setCookie gets their url instead of a domain, and add_cookie() (which then uses the current page's host)
+    # only takes them while the current page is on their host.
+    def _push_http_cookies(self):
+        for url, cookie in self.http_fast_path.pop_new_cookies():
+            cdp_cookie = {key: value for key, value in cookie.items() if key != "expiry"}
+            if "expiry" in cookie: cdp_cookie["expires"] = cookie["expiry"]
+            if "domain" not in cookie: cdp_cookie["url"] = url
+            try: self.driver.execute_cdp_cmd("Network.setCookie", cdp_cookie)
+            except Exception:
+                try:
+                    if "domain" not in cookie and urllib.parse.urlsplit(self.driver.current_url).hostname != urllib.parse.urlsplit(url).hostname:
+                        raise ValueError(f"Host-only cookie {cookie['name']} belongs to {url}, not to the current page")
+                    self.driver.add_cookie(cookie)
+                except Exception as add_cookie_e: self.log_err_no_msg(add_cookie_e)
+
     # ----------------------------MISC METHODS----------------------------
     # Easy way to clear the console anytime.
     def clear_console(self): os.system("cls")
 
-    # Logs an exception and displays the provided error message to the user (requiring Enter press). argument "error" should be a descriptive string or a captured exception.
+    # Returns a dict of helper name -> {"calls", "commands", "commands_per_call"} for the WebDriver commands issued so far.
+    # Commands issued outside any helper (e.g., through self.driver directly) are reported under "other" with 0 calls.
+    def command_stats(self):
+        return {
+            helper: {
+                "calls": self.helper_calls[helper],
+                "commands": self.command_counts[helper],
+                "commands_per_call": self.command_counts[helper] / self.helper_calls[helper] if self.helper_calls[helper] else None,
+            }
+            for helper in sorted(set(self.command_counts) | set(self.helper_calls))
+        }
+
+    def reset_command_stats(self):
+        self.command_counts.clear()
+        self.helper_calls.clear()
+
+    # Wraps self.driver.execute (every WebDriver command, including WebElement commands, goes through it) to count commands per helper.
+    # Called by new_driver() for each new driver.
+    def _count_commands(self):
+        execute = self.driver.execute
+        def counting_execute(driver_command, params = None):
+            self.command_counts[self._active_helper or "other"] += 1
+            self._commands_issued += 1
+            return execute(driver_command, params)
+        self.driver.execute = counting_execute
+
+    # Wraps a WebDriverWait condition to count poll iterations (for metrics)
+    def _counts_polls(self, condition):
+        def counted_condition(driver):
+            self._wait_polls += 1
+            return condition(driver)
+        return counted_condition
+
+    # Logs an exception and displays the provided error message to the user (requiring Enter press, unless not self.interactive). argument "error" should be a descriptive string or a captured exception.
     # No exception checking on "error" argument. There is no good way to validate the possible Exceptions that may be passed (could even be a custom exception from this module or an imported module)
     def display_err_msg(self, error, fail_msg):
         if isinstance(fail_msg, str) == False and self.suppress_notifications == False: raise InvalidTypePassed("fail_msg", type(fail_msg), str)
 
-        self.error_col.append((datetime.datetime.now(), error))
-        if self.suppress_notifications == False: input(fail_msg)
+        self.error_store.record(error, fail_msg)
+        # The window the driver was in is gone, so the tracked handle can't be trusted. The next switch_window() will really switch.
+        if isinstance(error, selenium.common.exceptions.NoSuchWindowException): self.curr_win_handle = None
+        if self.suppress_notifications == False and self.interactive: input(fail_msg)
 
     # Logs an error but does not inform the user. Should be a string or a captured exception.
     def log_err_no_msg(self, error):
-        if isinstance(error, str) == False and self.suppress_notifications == False: raise InvalidTypePassed(error, type(error), str)
+        if isinstance(error, (str, BaseException)) == False and self.suppress_notifications == False: raise InvalidTypePassed("error", type(error), (str, BaseException))
 
-        self.error_col.append((datetime.datetime.now(), error))
+        self.error_store.record(error)
 
     # Called if first attempt to switch windows fails. This attempts to switch to the first window in self.driver.window_handles. If this fails, there should be no windows open (requiring a new webdriver).
+    @_instrumented
     def no_window_err(self):
         try:
-            self.driver.switch_to.window(self.driver.window_handles[0])
+            first_window = self.driver.window_handles[0]
+            self.driver.switch_to.window(first_window)
         except Exception as switch_to_0_win_e:
+            self.curr_win_handle = None
             if self.suppress_notifications == False:
                 self.display_err_msg(switch_to_0_win_e, "Failed to switch to any window. Start new webdriver?")
             return False
 
+        self.curr_win_handle = first_window
+
     # Checks numerous variables to ensure they are the correct type. Raises exception if type is incorrect.
     # All arguments MUST be lists/tuples, even if they have only one element. (Note that if checking just one element, just doing the check directly, without check_to_raise_exc(), and then directly callin InvalidTypePassed(), is better.)
     # vars_to_check is a list/tuple of all variables to validate type
@@ -390,6 +1920,25 @@ class InvalidSearchForElement(Exception):
         message = f"Your provided argument of '{search_by}' is not a valid argument to search for an element. Must use one of these (as string): 'id', 'name', 'xpath', 'link_text', 'partial_link_text', 'tag_name', 'class_name', 'css_selector'."
         super().__init__(message)
 
+# Raised for an unknown launch profile name, or an invalid key/value in a profile dict (see LAUNCH_PROFILES).
+class InvalidLaunchProfile(Exception):
+    def __init__(self, profile):
+        message = f"Invalid launch profile: {profile}. Use one of these names (as string): {', '.join(repr(name) for name in LAUNCH_PROFILES)}, or a dict with keys from LAUNCH_PROFILES['interactive']."
+        super().__init__(message)
+
+# Raised for a wait_strategy that is not one of WAIT_STRATEGIES.
+class InvalidWaitStrategy(Exception):
+    def __init__(self, wait_strategy):
+        message = f"Your provided argument of '{wait_strategy}' is not a valid wait strategy. Must use one of these (as string): {', '.join(repr(strategy) for strategy in WAIT_STRATEGIES)}."
+        super().__init__(message)
+
+# Raised by WebdriverMain.run_steps() for a step that is not a tuple/list of an action from STEP_ACTIONS followed by the right number of arguments.
+class InvalidStep(Exception):
+    def __init__(self, step):
+        expected = "; ".join(f"{action}: {count} arguments" for action, count in STEP_ACTIONS.items())
+        message = f"Invalid step: {step}. Steps are (action, *arguments, fail_msg) tuples ({expected}; fail_msg included)."
+        super().__init__(message)
+
 # This exception is available for any method to check a variable type. An invalid type will raise this error.
 # To check multiple variables at once, use WedriverMain() method check_types_to_raise_exc(). That method loops and checks each variable with the below class.
 # relevant_variable is a string that can be printed to the user to identify which variable is invalid
@@ -400,6 +1949,12 @@ class InvalidTypePassed(Exception):
         message = f"Argument {relevant_variable} must be {type_needed}. Received {type_passed}."
         super().__init__(message)
 
+# Raised when a feature needs an optional module that is not installed.
+class MissingOptionalModule(Exception):
+    def __init__(self, module, feature):
+        message = f"Module '{module}' is required for {feature}. Install it to use this feature."
+        super().__init__(message)
+
 # Exception if lists/tuples provided to a method have unmatched lengths when they must match (e.g., they will be zipped).
 class InvalidListLength(Exception):
     def __init__(self, lists_tuples):
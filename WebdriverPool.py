@@ -0,0 +1,208 @@
+import sys
+
+if __name__ == "__main__":
+    input("This is a supporting file. Do not execute.\n\nPress Enter to exit.")
+    sys.exit()
+
+import contextlib
+import queue
+import threading
+import time
+
+from WebdriverFramework import WebdriverMain, InvalidTypePassed
+
+# Keeps a number of WebdriverMain sessions warm so that jobs don't pay for a cold browser launch.
+# Sessions are checked out with checkout() (context manager) or acquire()/release(). Thread-safe: any number of worker threads can share one pool.
+# On return, each session is health-checked. Sessions that are unhealthy, have been used max_uses times, or have collected max_errors errors are recycled
+# with restart_driver() by background refill threads, off the checkout path.
+# Example:
+    # pool = WebdriverPool(size = 4)
+    # with pool.checkout(timeout = 30) as webd:
+        # webd.get_url(webd.main_win_handle, "https://www.selenium.dev/")
+    # pool.close()
+class WebdriverPool:
+    # Arguments:
+        # size: number of sessions kept by the pool (idle + checked out + being recycled)
+        # max_uses: a session is recycled after this many checkouts
+        # max_errors: a session is recycled after collecting this many errors (error_store.total, counted across checkouts) or after a checkout that raised an exception
+        # checkout_timeout: default seconds to wait in acquire()/checkout() for a ready session
+        # refill_threads: number of background threads starting/restarting sessions
+        # webdriver_kwargs: passed to WebdriverMain(). suppress_notifications defaults to True, since nobody is watching a pooled session's console.
+    def __init__(self,
+            size = 2,
+            max_uses = 50,
+            max_errors = 3,
+            checkout_timeout = 30,
+            refill_threads = 1,
+            **webdriver_kwargs
+    ):
+        for var, var_str in ((size, "size"), (max_uses, "max_uses"), (max_errors, "max_errors"), (refill_threads, "refill_threads")):
+            if isinstance(var, int) == False or var < 1: raise InvalidTypePassed(var_str, type(var), "int >= 1")
+        if isinstance(checkout_timeout, (int, float)) == False: raise InvalidTypePassed("checkout_timeout", type(checkout_timeout), (int, float))
+
+        self.size = size
+        self.max_uses = max_uses
+        self.max_errors = max_errors
+        self.checkout_timeout = checkout_timeout
+
+        webdriver_kwargs.setdefault("suppress_notifications", True)
+        self.webdriver_kwargs = webdriver_kwargs
+
+        self._idle = queue.Queue() # Ready sessions
+        self._refill = queue.Queue() # Work for refill threads: a session to restart, or None to start a new one
+        self._stats = {} # id(session) -> [uses, errors, error count at checkout]
+        self._checked_out = set() # ids of sessions currently checked out
+        self._lock = threading.Lock()
+        self._closed = False
+
+        for _ in range(size): self._refill.put(None)
+
+        self._threads = [
+            threading.Thread(target = self._refill_loop, name = f"WebdriverPool-refill-{i}", daemon = True)
+            for i in range(refill_threads)
+        ]
+        for thread in self._threads: thread.start()
+
+    # ----------------------------CHECKOUT/RETURN----------------------------
+    # Context manager. Yields a ready WebdriverMain and returns it to the pool afterwards.
+    # An exception raised inside the with block marks the session as failed (it is recycled) and is re-raised.
+    @contextlib.contextmanager
+    def checkout(self, timeout = None):
+        webd = self.acquire(timeout)
+        failed = False
+        try:
+            yield webd
+        except BaseException:
+            failed = True
+            raise
+        finally:
+            self.release(webd, failed = failed)
+
+    # Waits up to timeout seconds (default self.checkout_timeout) for a ready session and returns it.
+    # Raises PoolTimeout if none becomes available and PoolClosed if the pool has been closed.
+    def acquire(self, timeout = None):
+        if self._closed: raise PoolClosed()
+        if timeout is None: timeout = self.checkout_timeout
+
+        try: webd = self._idle.get(timeout = timeout)
+        except queue.Empty: raise PoolTimeout(timeout)
+
+        with self._lock:
+            self._checked_out.add(id(webd))
+            self._stats[id(webd)][2] = webd.error_store.total
+        return webd
+
+    # Returns a session to the pool. failed = True forces a recycle.
+    def release(self, webd, failed = False):
+        with self._lock:
+            if id(webd) not in self._checked_out: raise SessionNotCheckedOut()
+            self._checked_out.discard(id(webd))
+
+            stats = self._stats[id(webd)]
+            stats[0] += 1
+            stats[1] += webd.error_store.total - stats[2] + (1 if failed else 0)
+            worn_out = stats[0] >= self.max_uses or stats[1] >= self.max_errors or failed
+
+        if self._closed:
+            self._discard(webd)
+            return
+
+        if worn_out == False and self.is_healthy(webd): self._idle.put(webd)
+        else: self._refill.put(webd)
+
+    # Cheap liveness check. A session is healthy if the browser answers and its main window still exists.
+    def is_healthy(self, webd):
+        try: return webd.main_win_handle in webd.driver.window_handles
+        except Exception: return False
+
+    # ----------------------------POOL MANAGEMENT----------------------------
+    # Blocks until all sessions are ready (or timeout seconds pass). Returns True if the pool is fully warm.
+    def wait_until_warm(self, timeout = None):
+        deadline = None if timeout is None else time.monotonic() + timeout
+        while self._idle.qsize() + len(self._checked_out) < self.size:
+            if self._closed or (deadline is not None and time.monotonic() >= deadline): return False
+            time.sleep(0.05)
+        return True
+
+    # Number of ready sessions right now
+    def idle_count(self): return self._idle.qsize()
+
+    # Stops refill threads and quits all idle sessions. Checked-out sessions are quit when they are released.
+    def close(self):
+        if self._closed: return
+        self._closed = True
+
+        for _ in self._threads: self._refill.put(_STOP)
+        for thread in self._threads: thread.join()
+
+        while True:
+            try: self._discard(self._idle.get_nowait())
+            except queue.Empty: break
+        # Sessions still waiting to be restarted
+        while True:
+            try: webd = self._refill.get_nowait()
+            except queue.Empty: break
+            if webd is not None and webd is not _STOP: self._discard(webd)
+
+    def __enter__(self): return self
+
+    def __exit__(self, exc_type, exc, tb): self.close()
+
+    # Background loop. Starts new sessions and restarts worn-out/unhealthy ones, then hands them to the idle queue.
+    # Consecutive failures back off (up to 30 seconds) so a broken environment doesn't spin.
+    def _refill_loop(self):
+        backoff = 0
+        while True:
+            webd = self._refill.get()
+            if webd is _STOP: return
+            # close() queues _STOP behind any pending requests: skip them instead of launching browsers only to discard them
+            if self._closed:
+                if webd is not None: self._discard(webd)
+                continue
+
+            try:
+                if webd is None: webd = WebdriverMain(**self.webdriver_kwargs)
+                else: webd.restart_driver()
+            except Exception:
+                pass # Health check below decides what happens next
+
+            if webd is not None and self.is_healthy(webd):
+                backoff = 0
+                with self._lock: self._stats[id(webd)] = [0, 0, webd.error_store.total]
+                if self._closed: self._discard(webd)
+                else: self._idle.put(webd)
+                continue
+
+            if webd is not None: self._discard(webd)
+            if self._closed: return
+
+            backoff = min(backoff * 2 or 0.5, 30)
+            time.sleep(backoff)
+            self._refill.put(None)
+
+    def _discard(self, webd):
+        with self._lock: self._stats.pop(id(webd), None)
+        if hasattr(webd, "driver"): webd.stop_driver()
+        webd.error_store.close()
+
+# Marker telling a refill thread to exit
+_STOP = object()
+
+# ----------------------------EXCEPTIONS CLASSES----------------------------
+# Raised by WebdriverPool.acquire()/checkout() when no session becomes ready in time.
+class PoolTimeout(Exception):
+    def __init__(self, timeout):
+        message = f"No webdriver session became available within {timeout} seconds."
+        super().__init__(message)
+
+# Raised when checking out from a closed WebdriverPool.
+class PoolClosed(Exception):
+    def __init__(self):
+        message = "The webdriver pool has been closed."
+        super().__init__(message)
+
+# Raised when releasing a session that is not checked out from this pool (e.g., released twice).
+class SessionNotCheckedOut(Exception):
+    def __init__(self):
+        message = "This webdriver session is not checked out from this pool."
+        super().__init__(message)
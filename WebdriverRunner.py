@@ -0,0 +1,286 @@
+import sys
+
+if __name__ == "__main__":
+    input("This is a supporting file. Do not execute.\n\nPress Enter to exit.")
+    sys.exit()
+
+import collections
+import itertools
+import multiprocessing
+import os
+import pickle
+import queue
+import signal
+import subprocess
+import time
+
+from WebdriverFramework import WebdriverMain, InvalidTypePassed
+
+# Runs many jobs across a pool of worker processes, one WebdriverMain (one browser) per worker.
+# job_func(webd, job) is called in a worker for every job and its return value is sent back. Results stream out of run() as jobs finish (completion order, not
+# input order). Jobs are read from the iterable only when a worker is free and run() only moves on when its results are consumed, so neither side
+# piles up in memory: a queue of tens of thousands of URLs can be a generator.
+# A job fails if job_func raises or returns False (like WebdriverMain's helpers). The worker then restarts its driver and the job is retried,
+# possibly on another worker, up to max_attempts attempts in total. A worker process that dies (or runs a job longer than job_timeout) is replaced,
+# and its job counts as a failed attempt.
+# job_func, the jobs, the results and webdriver_kwargs cross process boundaries, so they must be picklable: job_func must be a module-level function,
+# and results should be plain data (not WebElements). With the default "spawn" start method, the calling script needs an if __name__ == "__main__": guard.
+# Example:
+    # def page_title(webd, url):
+        # if webd.get_url(webd.main_win_handle, url) == False: return False
+        # return webd.driver.title
+    #
+    # if __name__ == "__main__":
+        # runner = WebdriverRunner(page_title, workers = 4, profile = "headless-fast")
+        # for result in runner.run(urls):
+            # print(result.job, result.result if result.ok else result.error)
+class WebdriverRunner:
+    # Arguments:
+        # job_func: function(webd, job) run for every job
+        # workers: number of worker processes (browsers). Default: default_worker_count().
+        # max_attempts: attempts per job, the first one included
+        # job_timeout: optional seconds after which a running job's worker is killed and replaced (hung browser). None = no limit.
+        # max_worker_restarts: consecutive worker deaths (with no job succeeding in between) before run() gives up with TooManyWorkerRestarts. Default: 3 per worker.
+            # Any successful job resets the count, so occasional browser crashes over a long run never add up to an abort; a machine where browsers can't run at all still fails fast.
+        # start_method: multiprocessing start method. "spawn" (default) does not inherit the parent's threads or open connections.
+        # webdriver_kwargs: passed to WebdriverMain() in every worker. suppress_notifications defaults to True and interactive to False, since nobody can answer a worker's prompts.
+    def __init__(self,
+            job_func,
+            workers = None,
+            max_attempts = 2,
+            job_timeout = None,
+            max_worker_restarts = None,
+            start_method = "spawn",
+            **webdriver_kwargs
+    ):
+        if callable(job_func) == False: raise InvalidTypePassed("job_func", type(job_func), "callable")
+        if workers is None: workers = default_worker_count()
+        for var, var_str in ((workers, "workers"), (max_attempts, "max_attempts")):
+            if isinstance(var, int) == False or var < 1: raise InvalidTypePassed(var_str, type(var), "int >= 1")
+        if isinstance(job_timeout, (int, float, type(None))) == False: raise InvalidTypePassed("job_timeout", type(job_timeout), (int, float, type(None)))
+        if max_worker_restarts is None: max_worker_restarts = workers * 3
+        if start_method not in multiprocessing.get_all_start_methods(): raise InvalidTypePassed("start_method", start_method, multiprocessing.get_all_start_methods())
+
+        self.job_func = job_func
+        self.workers = workers
+        self.max_attempts = max_attempts
+        self.job_timeout = job_timeout
+        self.max_worker_restarts = max_worker_restarts
+        self.start_method = start_method
+
+        webdriver_kwargs.setdefault("suppress_notifications", True)
+        webdriver_kwargs.setdefault("interactive", False)
+        self.webdriver_kwargs = webdriver_kwargs
+
+        # Counters of the last (or current) run()
+        self.stats = collections.Counter()
+
+    # Runs job_func over jobs (any iterable) and yields a JobResult per job as it finishes. Stopping the iteration early (break, close()) stops the workers.
+    def run(self, jobs):
+        self.stats = collections.Counter()
+        self._consecutive_deaths = 0 # Worker deaths since the last successful job
+        context = multiprocessing.get_context(self.start_method)
+        results = context.Queue()
+        workers = {}
+        worker_ids = itertools.count()
+        pending = enumerate(jobs)
+        retries = collections.deque() # Failed (index, job, attempts) waiting for a free worker
+        exhausted = False
+
+        def start_worker():
+            worker_id = next(worker_ids)
+            tasks = context.SimpleQueue()
+            process = context.Process(
+                target = _worker_main,
+                args = (worker_id, self.job_func, self.webdriver_kwargs, tasks, results),
+                name = f"WebdriverRunner-worker-{worker_id}",
+                daemon = True
+            )
+            process.start()
+            workers[worker_id] = _Worker(process, tasks)
+
+        try:
+            for _ in range(self.workers): start_worker()
+
+            while True:
+                # Hands a job to every ready, idle worker. Retries go first.
+                for worker in workers.values():
+                    if worker.ready == False or worker.task is not None: continue
+                    if retries: task = retries.popleft()
+                    elif exhausted: break
+                    else:
+                        try: index, job = next(pending)
+                        except StopIteration:
+                            exhausted = True
+                            break
+                        task = (index, job, 1)
+
+                    try: payload = pickle.dumps(task)
+                    except Exception as pickle_e:
+                        self.stats["failed"] += 1
+                        yield JobResult(task[0], task[1], False, None, f"{type(pickle_e).__name__}: job is not picklable: {pickle_e}", task[2])
+                        continue
+                    worker.task = task
+                    worker.started = time.monotonic()
+                    worker.tasks.put(payload)
+
+                if exhausted and retries == collections.deque() and all(worker.task is None for worker in workers.values()): return
+
+                try: messages = [results.get(timeout = 0.1)]
+                except queue.Empty: messages = []
+                for result in self._handle_messages(messages, workers, retries): yield result
+
+                # Replaces dead and timed out workers. Messages they sent before dying are handled first, so a finished job is never retried.
+                for worker_id, worker in list(workers.items()):
+                    timed_out = self.job_timeout is not None and worker.task is not None and time.monotonic() - worker.started > self.job_timeout
+                    if worker.process.is_alive() and timed_out == False: continue
+
+                    # Also kills the worker's chromedriver and browser: a hung browser (timeout) or a crashed worker would otherwise leave them running
+                    _kill_process_tree(worker.process)
+                    worker.process.join()
+                    for result in self._handle_messages(_drain(results), workers, retries): yield result
+
+                    del workers[worker_id]
+                    if worker.task is not None:
+                        reason = f"job timed out after {self.job_timeout} seconds" if timed_out else f"worker process died (exit code {worker.process.exitcode})"
+                        result = self._job_failed(worker.task, f"WorkerCrashed: {reason}", retries)
+                        if result is not None: yield result
+
+                    self.stats["worker_restarts"] += 1
+                    self._consecutive_deaths += 1
+                    if self._consecutive_deaths > self.max_worker_restarts: raise TooManyWorkerRestarts(self.max_worker_restarts)
+                    start_worker()
+        finally:
+            self._stop_workers(workers)
+            results.close()
+            results.cancel_join_thread()
+
+    # Handles worker messages. Returns the JobResults that are final (succeeded, or out of attempts).
+    def _handle_messages(self, messages, workers, retries):
+        final = []
+        for message in messages:
+            worker = workers.get(message[1])
+            if worker is None: continue # Worker already replaced
+
+            if message[0] == "ready":
+                worker.ready = True
+                continue
+
+            task, worker.task = worker.task, None
+            ok, payload, error, exiting = message[2:]
+            if exiting: worker.ready = False # Its driver is gone; the worker is about to exit and be replaced
+            if ok:
+                self.stats["succeeded"] += 1
+                self._consecutive_deaths = 0
+                final.append(JobResult(task[0], task[1], True, pickle.loads(payload), None, task[2]))
+                continue
+
+            result = self._job_failed(task, error, retries)
+            if result is not None: final.append(result)
+        return final
+
+    # Queues a failed attempt for retry, or returns its final JobResult once it is out of attempts
+    def _job_failed(self, task, error, retries):
+        index, job, attempts = task
+        if attempts < self.max_attempts:
+            self.stats["retried"] += 1
+            retries.append((index, job, attempts + 1))
+            return None
+        self.stats["failed"] += 1
+        return JobResult(index, job, False, None, error, attempts)
+
+    # Asks every worker to quit its driver and exit. Workers that don't exit in time are killed.
+    def _stop_workers(self, workers):
+        for worker in workers.values():
+            try: worker.tasks.put(None)
+            except Exception: pass
+        deadline = time.monotonic() + 30
+        for worker in workers.values():
+            worker.process.join(max(deadline - time.monotonic(), 0))
+            if worker.process.is_alive():
+                _kill_process_tree(worker.process)
+                worker.process.join()
+
+# Parent-side state of one worker process
+class _Worker:
+    def __init__(self, process, tasks):
+        self.process = process
+        self.tasks = tasks # Pickled (index, job, attempts) tasks for this worker, None to stop
+        self.ready = False # True once the worker's driver is up
+        self.task = None # Task currently running
+        self.started = None # When the current task was handed out (time.monotonic())
+
+# Result of one job, as yielded by WebdriverRunner.run()
+    # index: position of the job in the jobs iterable
+    # ok: False if every attempt failed. result is then None and error describes the last failure ("ExceptionType: message").
+    # attempts: number of attempts made
+JobResult = collections.namedtuple("JobResult", ("index", "job", "ok", "result", "error", "attempts"))
+
+# Default number of workers: one per CPU core, capped by available memory at memory_per_worker_mb per browser (if the OS reports it).
+def default_worker_count(memory_per_worker_mb = 400):
+    workers = os.cpu_count() or 1
+    try: available_mb = os.sysconf("SC_AVPHYS_PAGES") * os.sysconf("SC_PAGE_SIZE") / 1024 / 1024
+    except (AttributeError, ValueError, OSError): return workers
+    return max(1, min(workers, int(available_mb // memory_per_worker_mb)))
+
+# Kills a worker process along with its chromedriver and browser.
+# POSIX: workers lead their own process group (see _worker_main()), which their children inherit, so the whole group is killed. This also works after the
+# worker itself has died, as long as its children are alive. Windows: taskkill /T kills the process tree of a running worker.
+def _kill_process_tree(process):
+    if os.name == "nt":
+        if process.is_alive(): subprocess.run(["taskkill", "/F", "/T", "/PID", str(process.pid)], stdout = subprocess.DEVNULL, stderr = subprocess.DEVNULL)
+    else:
+        try: os.killpg(process.pid, signal.SIGKILL)
+        except OSError: pass # No such group: the worker died before calling setsid() and started nothing
+    if process.is_alive(): process.kill()
+
+# Every message currently in a queue
+def _drain(results):
+    messages = []
+    while True:
+        try: messages.append(results.get_nowait())
+        except queue.Empty: return messages
+
+# Worker process. Starts a driver, then runs tasks until it gets None. A failed job restarts the driver so that its retry starts fresh;
+# if the restart fails, the worker exits and the parent replaces it.
+# Messages to the parent: ("ready", worker_id) and ("done", worker_id, ok, pickled result, error, exiting). A failed job is reported once the restart is over,
+# so the parent never hands the retry to a worker that is still restarting; exiting = True tells it not to hand this worker anything else.
+def _worker_main(worker_id, job_func, webdriver_kwargs, tasks, results):
+    # Own process group, so that the parent can kill this worker together with its chromedriver and browser (see _kill_process_tree())
+    if hasattr(os, "setsid"): os.setsid()
+
+    webd = WebdriverMain(**webdriver_kwargs)
+    if hasattr(webd, "driver") == False: sys.exit(1) # Driver failed to start. The parent replaces this worker.
+    results.put(("ready", worker_id))
+
+    try:
+        while True:
+            payload = tasks.get()
+            if payload is None: return
+            index, job, attempts = pickle.loads(payload)
+
+            try:
+                result = job_func(webd, job)
+                if result is False: raise JobReturnedFalse()
+                message = ("done", worker_id, True, pickle.dumps(result), None, False)
+            except Exception as job_e:
+                restarted = webd.restart_driver() != False
+                results.put(("done", worker_id, False, None, f"{type(job_e).__name__}: {job_e}", restarted == False))
+                if restarted == False: sys.exit(1)
+                continue
+            results.put(message)
+    finally:
+        webd.close_out()
+
+# ----------------------------EXCEPTIONS CLASSES----------------------------
+# Raised by WebdriverRunner.run() when workers keep dying (e.g., the browser can't start on this machine).
+class TooManyWorkerRestarts(Exception):
+    def __init__(self, max_worker_restarts):
+        message = f"Worker processes died more than {max_worker_restarts} times in a row without a job succeeding. Check that a webdriver can start on this machine."
+        super().__init__(message)
+
+# Recorded as a job's error when job_func returns False
+class JobReturnedFalse(Exception):
+    def __init__(self):
+        message = "job_func returned False."
+        super().__init__(message)
@@ -0,0 +1,103 @@
+# Framework overhead benchmark. Runs WebdriverMain against the in-process fake WebDriver server (fake_webdriver_server.py), so no browser is needed.
+# Scenarios:
+    # find_enter_text_enter: the find/type/Enter composite in a loop
+    # window_switching: find_click() round-robin across many windows
+    # find_ele_misses: find_ele() for a selector that is never found (short wait_time)
+    # find_click_cached: find_click() on the same element with a LocatorCache (hits skip the element search)
+# Reports per scenario: round trips per operation, throughput, p50/p99 latency, and the framework's own time per operation
+# (p50 minus round trips x the server's configured latency), which separates framework overhead from "browser" time.
+# Usage: python benchmarks/bench_framework_overhead.py [--iterations 200] [--latency 0.002] [--windows 8] [--miss-wait 0.2]
+import argparse
+import os
+import statistics
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+import WebdriverFramework
+from fake_webdriver_server import FakeWebdriverServer
+
+
+# Runs operation(i) iterations times. Returns a dict of results for one scenario.
+def measure(server, operation, iterations):
+    latencies = []
+    server.reset_count()
+    start = time.perf_counter()
+    for i in range(iterations):
+        op_start = time.perf_counter()
+        operation(i)
+        latencies.append(time.perf_counter() - op_start)
+    elapsed = time.perf_counter() - start
+    round_trips = server.reset_count()
+
+    latencies.sort()
+    p50 = statistics.median(latencies)
+    p99 = latencies[min(len(latencies) - 1, int(len(latencies) * 0.99))]
+    round_trips_per_op = round_trips / iterations
+    return {
+        "round_trips_per_op": round_trips_per_op,
+        "ops_per_s": iterations / elapsed,
+        "p50_ms": p50 * 1000,
+        "p99_ms": p99 * 1000,
+        "framework_ms": max(p50 - round_trips_per_op * server.latency, 0) * 1000,
+    }
+
+
+def scenario_find_enter_text_enter(webd, iterations):
+    handle = webd.main_win_handle
+    return lambda i: webd.find_enter_text_enter(handle, "id", "search", f"query {i}", "search box")
+
+
+def scenario_window_switching(webd, iterations, windows):
+    handles = [webd.main_win_handle]
+    for _ in range(windows - 1):
+        webd.driver.switch_to.new_window("tab")
+        handles.append(webd.driver.current_window_handle)
+    webd.sync_window_handle()
+    return lambda i: webd.find_click(handles[i % len(handles)], "id", "button", "button")
+
+
+def scenario_find_ele_misses(webd, iterations, miss_wait):
+    handle = webd.main_win_handle
+    return lambda i: webd.find_ele(handle, "id", "missing-element", "missing element", wait_time = miss_wait)
+
+
+def scenario_find_click_cached(webd, iterations):
+    webd.locator_cache = WebdriverFramework.LocatorCache()
+    handle = webd.main_win_handle
+    return lambda i: webd.find_click(handle, "id", "button", "button")
+
+
+def main():
+    parser = argparse.ArgumentParser(description = "Measure WebdriverMain overhead against a fake WebDriver server.")
+    parser.add_argument("--iterations", type = int, default = 200)
+    parser.add_argument("--latency", type = float, default = 0.002, help = "seconds added to every request by the fake server")
+    parser.add_argument("--windows", type = int, default = 8)
+    parser.add_argument("--miss-wait", type = float, default = 0.2, help = "wait_time for the find_ele_misses scenario")
+    args = parser.parse_args()
+
+    with FakeWebdriverServer(latency = args.latency) as server:
+        scenarios = (
+            ("find_enter_text_enter", lambda webd: scenario_find_enter_text_enter(webd, args.iterations), args.iterations),
+            ("window_switching", lambda webd: scenario_window_switching(webd, args.iterations, args.windows), args.iterations),
+            # Misses are dominated by wait_time; fewer iterations keep the run short
+            ("find_ele_misses", lambda webd: scenario_find_ele_misses(webd, args.iterations, args.miss_wait), max(args.iterations // 10, 5)),
+            ("find_click_cached", lambda webd: scenario_find_click_cached(webd, args.iterations), args.iterations),
+        )
+
+        print(f"\nfake server latency: {args.latency * 1000:.1f} ms per round trip")
+        print(f"{'scenario':<24} {'trips/op':>9} {'ops/s':>9} {'p50 (ms)':>9} {'p99 (ms)':>9} {'framework (ms)':>15}")
+        for name, setup, iterations in scenarios:
+            webd = WebdriverFramework.WebdriverMain(suppress_notifications = True, interactive = False, executor_url = server.url)
+            result = measure(server, setup(webd), iterations)
+            print(
+                f"{name:<24} {result['round_trips_per_op']:>9.2f} {result['ops_per_s']:>9.1f} "
+                f"{result['p50_ms']:>9.2f} {result['p99_ms']:>9.2f} {result['framework_ms']:>15.2f}"
+            )
+            webd.close_out()
+
+
+if __name__ == "__main__":
+    main()
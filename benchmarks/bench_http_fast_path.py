@@ -0,0 +1,102 @@
+# HTTP fast path benchmark: fetch_page() over a mix of server-rendered and client-rendered (JavaScript) pages, with and without an HttpFastPath.
+# Pages come from a local HTTP server in this process. The "browser" is the fake WebDriver server (fake_webdriver_server.py) with --browser-latency per
+# round trip, so no Chrome is needed; pass --chrome to use a real headless Chrome instead.
+# Pages:
+    # /article/N: server-rendered text (served over HTTP by the "auto" route)
+    # /app/N: an empty app shell that renders with JavaScript (the content heuristic sends it to the browser)
+    # /legacy/N: server-rendered, but routed to the browser by a URL rule (--rules)
+# Every response sets a visit cookie and the server counts requests that carried the driver's cookie, to show cookie sharing in both directions.
+# Reports per mode: total time, time per page, and the browser vs. HTTP split.
+# Usage: python benchmarks/bench_http_fast_path.py [--pages 60] [--browser-latency 0.05] [--chrome]
+import argparse
+import os
+import sys
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+import WebdriverFramework
+from fake_webdriver_server import FakeWebdriverServer
+
+ARTICLE_PAGE = "<html><head><title>Article {n}</title></head><body><h1>Article {n}</h1>" + "<p>Server-rendered paragraph of text.</p>" * 20 + "</body></html>"
+APP_PAGE = "<html><head><title>App {n}</title></head><body><div id='root'></div><script src='/static/app.js'></script></body></html>"
+
+
+class PageHandler(BaseHTTPRequestHandler):
+    disable_nagle_algorithm = True
+    shared_cookie_requests = 0 # Requests that carried the cookie set through the driver
+
+    def log_message(self, format, *args): pass
+
+    def do_GET(self):
+        if "driver_cookie=from-driver" in self.headers.get("Cookie", ""): PageHandler.shared_cookie_requests += 1
+        n = self.path.rstrip("/").rsplit("/", 1)[-1]
+        body = (APP_PAGE if self.path.startswith("/app/") else ARTICLE_PAGE).format(n = n).encode()
+        self.send_response(200)
+        self.send_header("Content-Type", "text/html; charset=utf-8")
+        self.send_header("Content-Length", str(len(body)))
+        self.send_header("Set-Cookie", f"last_visit={n}; Path=/")
+        self.end_headers()
+        self.wfile.write(body)
+
+
+def run(webd, urls):
+    start = time.perf_counter()
+    for url in urls:
+        if webd.fetch_page(webd.main_win_handle, url) == False: print(f"failed: {url}")
+    return time.perf_counter() - start
+
+
+def main():
+    parser = argparse.ArgumentParser(description = "Compare fetch_page() with and without the HTTP fast path.")
+    parser.add_argument("--pages", type = int, default = 60)
+    parser.add_argument("--browser-latency", type = float, default = 0.05, help = "seconds added to every fake WebDriver request (ignored with --chrome)")
+    parser.add_argument("--rules", nargs = "*", default = ["*/legacy/*"], help = "URL patterns routed to the browser")
+    parser.add_argument("--chrome", action = "store_true", help = "use headless Chrome instead of the fake WebDriver server")
+    args = parser.parse_args()
+
+    httpd = ThreadingHTTPServer(("127.0.0.1", 0), PageHandler)
+    threading.Thread(target = httpd.serve_forever, daemon = True).start()
+    base_url = f"http://127.0.0.1:{httpd.server_address[1]}"
+    kinds = ("article", "article", "app", "legacy")
+    urls = [f"{base_url}/{kinds[i % len(kinds)]}/{i}" for i in range(args.pages)]
+
+    fake = None
+    if args.chrome: webdriver_kwargs = {"profile": "headless-fast"}
+    else:
+        fake = FakeWebdriverServer(latency = args.browser_latency).start()
+        webdriver_kwargs = {"executor_url": fake.url, "interactive": False}
+
+    print(f"\n{args.pages} pages: {kinds.count('article')}/{len(kinds)} server-rendered, {kinds.count('app')}/{len(kinds)} JavaScript, {kinds.count('legacy')}/{len(kinds)} routed to the browser by rule")
+    print(f"{'mode':<18} {'total (s)':>10} {'ms/page':>8} {'http':>6} {'browser':>8} {'fallbacks':>10}")
+    for mode in ("browser only", "HTTP fast path"):
+        fast_path = None if mode == "browser only" else WebdriverFramework.HttpFastPath(rules = [(pattern, "browser") for pattern in args.rules])
+        webd = WebdriverFramework.WebdriverMain(suppress_notifications = True, http_fast_path = fast_path, **webdriver_kwargs)
+
+        # A cookie set in the browser, which the HTTP session should send
+        webd.get_url(webd.main_win_handle, f"{base_url}/article/0")
+        webd.driver.add_cookie({"name": "driver_cookie", "value": "from-driver", "path": "/"})
+        PageHandler.shared_cookie_requests = 0
+
+        elapsed = run(webd, urls)
+        split = fast_path.split() if fast_path is not None else {"http": 0, "browser": len(urls), "fallbacks": 0}
+        print(f"{mode:<18} {elapsed:>10.2f} {elapsed / len(urls) * 1000:>8.1f} {split['http']:>6} {split['browser']:>8} {split['fallbacks']:>10}")
+
+        if fast_path is not None:
+            driver_cookies = {cookie["name"] for cookie in webd.driver.get_cookies()}
+            print(
+                f"\ncookie sharing: {PageHandler.shared_cookie_requests} requests carried the driver's cookie; "
+                f"cookie set over HTTP {'reached' if 'last_visit' in driver_cookies else 'did not reach'} the driver"
+            )
+            fast_path.close()
+        webd.close_out()
+
+    if fake is not None: fake.stop()
+    httpd.shutdown()
+
+
+if __name__ == "__main__":
+    main()
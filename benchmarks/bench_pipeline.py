@@ -0,0 +1,74 @@
+# Step pipeline benchmark: a login flow written with the find_* helpers vs the same flow as one run_steps() pipeline (see STEP_ACTIONS),
+# with and without merge_actions. Runs against the in-process fake WebDriver server (fake_webdriver_server.py), so no browser is needed.
+# Reports per variant: WebDriver commands per flow, p50 flow time, and flows per second.
+# Usage: python benchmarks/bench_pipeline.py [--iterations 100] [--latency 0.002]
+import argparse
+import os
+import statistics
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+import WebdriverFramework
+from fake_webdriver_server import FakeWebdriverServer
+
+LOGIN_URL = "http://fake.test/login"
+
+LOGIN_STEPS = [
+    ("navigate", LOGIN_URL, "login page"),
+    ("type", "id", "username", "user", "username box"),
+    ("type", "id", "password", "secret", "password box"),
+    ("press_enter", "id", "password", "password box"),
+    ("wait_for", "id", "account-menu", "account menu"),
+]
+
+
+def hand_written(webd):
+    handle = webd.main_win_handle
+    webd.get_url(handle, LOGIN_URL)
+    webd.find_enter_text(handle, "id", "username", "user", "username box")
+    webd.find_enter_text_enter(handle, "id", "password", "secret", "password box")
+    webd.find_ele(handle, "id", "account-menu", "account menu")
+
+
+def pipeline(webd): webd.run_steps(webd.main_win_handle, LOGIN_STEPS)
+
+
+def pipeline_merged(webd): webd.run_steps(webd.main_win_handle, LOGIN_STEPS, merge_actions = True)
+
+
+def measure(server, webd, flow, iterations):
+    latencies = []
+    server.reset_count()
+    start = time.perf_counter()
+    for _ in range(iterations):
+        flow_start = time.perf_counter()
+        flow(webd)
+        latencies.append(time.perf_counter() - flow_start)
+    elapsed = time.perf_counter() - start
+    return server.reset_count() / iterations, statistics.median(latencies) * 1000, iterations / elapsed
+
+
+def main():
+    parser = argparse.ArgumentParser(description = "Compare hand-written helper calls with run_steps() pipelines.")
+    parser.add_argument("--iterations", type = int, default = 100)
+    parser.add_argument("--latency", type = float, default = 0.002, help = "seconds added to every request by the fake server")
+    args = parser.parse_args()
+
+    with FakeWebdriverServer(latency = args.latency) as server:
+        webd = WebdriverFramework.WebdriverMain(suppress_notifications = True, interactive = False, executor_url = server.url)
+
+        print(f"\nfake server latency: {args.latency * 1000:.1f} ms per round trip")
+        print(f"{'variant':<26} {'commands/flow':>14} {'p50 (ms)':>9} {'flows/s':>9}")
+        for name, flow in (("hand-written helpers", hand_written), ("run_steps", pipeline), ("run_steps merge_actions", pipeline_merged)):
+            commands, p50, throughput = measure(server, webd, flow, args.iterations)
+            print(f"{name:<26} {commands:>14.1f} {p50:>9.2f} {throughput:>9.1f}")
+
+        if webd.error_store.total: print(f"\n{webd.error_store.total} errors recorded: {webd.error_store.summary()}")
+        webd.close_out()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,115 @@
+# Launch profile benchmark: page-load time and memory per profile (see LAUNCH_PROFILES) against a local test page.
+# Requires Chrome. The test page is served from this process and has images, web fonts, a stylesheet, a video and a slow script
+# (every asset is delayed by --asset-delay seconds to make resource loading visible).
+# Reports, per profile: median get_url() time, JS heap used (CDP Performance.getMetrics) and, if psutil is installed, the RSS of all Chrome processes.
+# Usage: python benchmarks/bench_profiles.py [--rounds 5] [--asset-delay 0.05] [--profiles interactive headless-fast scrape]
+import argparse
+import os
+import statistics
+import sys
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import WebdriverFramework
+
+try:
+    import psutil
+except ImportError:
+    psutil = None
+
+# Smallest valid PNG (1x1, transparent)
+PNG_1X1 = bytes.fromhex(
+    "89504e470d0a1a0a0000000d4948445200000001000000010806000000"
+    "1f15c4890000000d49444154789c6360000002000154a24f5d0000000049454e44ae426082"
+)
+
+TEST_PAGE = (
+    "<html><head><title>Profile benchmark</title>"
+    "<link rel='stylesheet' href='/static/site.css'>"
+    "<style>@font-face {font-family: bench; src: url('/static/bench.woff2');} body {font-family: bench;}</style>"
+    "</head><body>"
+    + "".join(f"<img src='/static/img{i}.png' width='1' height='1'>" for i in range(40))
+    + "<video src='/static/clip.mp4' autoplay muted></video>"
+    + "".join(f"<p class='row' id='row{i}'>Row {i}</p>" for i in range(300))
+    + "<script src='/static/slow.js'></script>"
+    + "</body></html>"
+)
+
+
+def make_handler(asset_delay):
+    class Handler(BaseHTTPRequestHandler):
+        def log_message(self, format, *args): pass
+
+        def do_GET(self):
+            if self.path == "/":
+                body, content_type = TEST_PAGE.encode(), "text/html"
+            else:
+                time.sleep(asset_delay * (10 if self.path.endswith(".js") else 1))
+                if self.path.endswith(".png"): body, content_type = PNG_1X1, "image/png"
+                elif self.path.endswith(".css"): body, content_type = b"p {color: #333;}", "text/css"
+                elif self.path.endswith(".js"): body, content_type = b"window.benchLoaded = true;", "application/javascript"
+                else: body, content_type = b"\0" * 4096, "application/octet-stream"
+            self.send_response(200)
+            self.send_header("Content-Type", content_type)
+            self.send_header("Content-Length", str(len(body)))
+            self.send_header("Cache-Control", "no-store")
+            self.end_headers()
+            self.wfile.write(body)
+
+    return Handler
+
+
+def chrome_rss_mb(webd):
+    if psutil is None: return None
+    try:
+        driver_process = psutil.Process(webd.driver.service.process.pid)
+        return sum(child.memory_info().rss for child in driver_process.children(recursive = True)) / 1024 / 1024
+    except Exception:
+        return None
+
+
+def js_heap_mb(webd):
+    try:
+        metrics = webd.driver.execute_cdp_cmd("Performance.getMetrics", {})["metrics"]
+        return next(m["value"] for m in metrics if m["name"] == "JSHeapUsedSize") / 1024 / 1024
+    except Exception:
+        return None
+
+
+def main():
+    parser = argparse.ArgumentParser(description = "Compare page-load time and memory per launch profile.")
+    parser.add_argument("--rounds", type = int, default = 5)
+    parser.add_argument("--asset-delay", type = float, default = 0.05)
+    parser.add_argument("--profiles", nargs = "+", default = list(WebdriverFramework.LAUNCH_PROFILES))
+    args = parser.parse_args()
+
+    httpd = ThreadingHTTPServer(("127.0.0.1", 0), make_handler(args.asset_delay))
+    threading.Thread(target = httpd.serve_forever, daemon = True).start()
+    url = f"http://127.0.0.1:{httpd.server_address[1]}/"
+
+    print(f"\n{'profile':<14} {'get_url (ms)':>13} {'JS heap (MB)':>13} {'Chrome RSS (MB)':>16}")
+    for profile in args.profiles:
+        webd = WebdriverFramework.WebdriverMain(suppress_notifications = True, profile = profile)
+        webd.driver.execute_cdp_cmd("Performance.enable", {})
+
+        load_times = []
+        for _ in range(args.rounds):
+            start = time.perf_counter()
+            webd.get_url(webd.main_win_handle, url)
+            load_times.append(time.perf_counter() - start)
+
+        heap, rss = js_heap_mb(webd), chrome_rss_mb(webd)
+        print(
+            f"{profile:<14} {statistics.median(load_times) * 1000:>13.1f} "
+            f"{'n/a' if heap is None else f'{heap:.1f}':>13} {'n/a' if rss is None else f'{rss:.1f}':>16}"
+        )
+        webd.close_out()
+
+    httpd.shutdown()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,68 @@
+# Job runner throughput benchmark: jobs per second of WebdriverRunner for a range of worker counts, against the in-process fake WebDriver server
+# (fake_webdriver_server.py), so no browser is needed. Each job navigates, clicks a button and reads the title (3-4 round trips).
+# --latency models the browser's response time; throughput should scale with workers until the CPU (or, with real browsers, RAM) runs out.
+# --crash-every makes every Nth job kill its worker process on its first attempt, to measure the cost of worker restarts and retries.
+# Usage: python benchmarks/bench_runner.py [--jobs 300] [--workers 1 2 4 8] [--latency 0.01] [--crash-every 0]
+import argparse
+import os
+import shutil
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from fake_webdriver_server import FakeWebdriverServer
+from WebdriverRunner import WebdriverRunner
+
+
+# Job: (page number, crash marker path or None). Module level so that worker processes can unpickle it.
+# The marker file records the crash, so the retry (in a new worker process) goes through.
+def visit_page(webd, job):
+    number, crash_marker = job
+    if crash_marker is not None and os.path.exists(crash_marker) == False:
+        open(crash_marker, "w").close()
+        os._exit(1)
+    handle = webd.main_win_handle
+    if webd.get_url(handle, f"http://fake.test/page/{number}") == False: return False
+    webd.find_click(handle, "id", "button", "button")
+    return webd.driver.title
+
+
+def main():
+    parser = argparse.ArgumentParser(description = "Measure WebdriverRunner throughput per worker count against a fake WebDriver server.")
+    parser.add_argument("--jobs", type = int, default = 300)
+    parser.add_argument("--workers", type = int, nargs = "+", default = [1, 2, 4, 8])
+    parser.add_argument("--latency", type = float, default = 0.01, help = "seconds added to every request by the fake server")
+    parser.add_argument("--crash-every", type = int, default = 0, help = "every Nth job kills its worker on the first attempt (0 = never)")
+    args = parser.parse_args()
+
+    with FakeWebdriverServer(latency = args.latency) as server:
+        print(f"\nfake server latency: {args.latency * 1000:.1f} ms per round trip, {args.jobs} jobs, {os.cpu_count()} CPUs")
+        print(f"{'workers':>7} {'jobs/s':>9} {'speedup':>8} {'failed':>7} {'retried':>8} {'restarts':>9}")
+        baseline = None
+        for workers in args.workers:
+            marker_dir = tempfile.mkdtemp(prefix = "bench_runner_")
+            jobs = (
+                (i, os.path.join(marker_dir, str(i)) if args.crash_every > 0 and i % args.crash_every == args.crash_every - 1 else None)
+                for i in range(args.jobs)
+            )
+            runner = WebdriverRunner(visit_page, workers = workers, executor_url = server.url)
+
+            # Throughput is measured from the first result on, so that worker start-up isn't counted
+            start = None
+            for result in runner.run(jobs):
+                if start is None: start = time.perf_counter()
+            throughput = (args.jobs - 1) / (time.perf_counter() - start)
+            shutil.rmtree(marker_dir, ignore_errors = True)
+
+            if baseline is None: baseline = throughput
+            print(
+                f"{workers:>7} {throughput:>9.1f} {throughput / baseline:>7.2f}x {runner.stats['failed']:>7} "
+                f"{runner.stats['retried']:>8} {runner.stats['worker_restarts']:>9}"
+            )
+
+
+if __name__ == "__main__":
+    main()
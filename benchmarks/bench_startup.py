@@ -0,0 +1,78 @@
+# Startup benchmark: compares cold and warm WebdriverMain.new_driver() times.
+# Requires Chrome. The cold phase needs network access (ChromeDriverManager) unless --driver-path is given.
+# Phases:
+    # cold: per-process memo cleared and an empty on-disk cache, so resolve_driver_path() falls through to ChromeDriverManager
+    # warm-disk: memo cleared, on-disk cache populated (what a freshly started worker process sees)
+    # warm: memo populated (what restart_driver() sees within one process)
+    # reattach: WebdriverMain(session_file = ...) joining the browser a previous instance left running (what a restarted controller process sees)
+# Each phase reports the median time for resolve_driver_path() alone and for the full new_driver() (browser launch included); reattach reports the whole WebdriverMain().
+# Usage: python benchmarks/bench_startup.py [--rounds 5] [--driver-path PATH]
+import argparse
+import os
+import statistics
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import WebdriverFramework
+
+
+def timed(func):
+    start = time.perf_counter()
+    func()
+    return time.perf_counter() - start
+
+
+def run_phase(webd, cache_file, rounds, clear_memo, clear_disk):
+    resolve_times, start_times = [], []
+    for _ in range(rounds):
+        if clear_memo: WebdriverFramework._resolved_driver_paths.clear()
+        if clear_disk and os.path.exists(cache_file): os.remove(cache_file)
+        resolve_times.append(timed(lambda: WebdriverFramework.resolve_driver_path(webd.driver_path, cache_file)))
+
+        if clear_memo: WebdriverFramework._resolved_driver_paths.clear()
+        if clear_disk and os.path.exists(cache_file): os.remove(cache_file)
+        webd.stop_driver()
+        start_times.append(timed(webd.new_driver))
+    return statistics.median(resolve_times), statistics.median(start_times)
+
+
+def main():
+    parser = argparse.ArgumentParser(description = "Compare cold and warm new_driver() times.")
+    parser.add_argument("--rounds", type = int, default = 5)
+    parser.add_argument("--driver-path", default = None, help = "explicit chromedriver path (skips resolution in every phase)")
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        cache_file = os.path.join(tmp_dir, "chromedriver_cache.json")
+        WebdriverFramework.DRIVER_CACHE_FILE = cache_file # Used by new_driver()
+
+        webd = WebdriverFramework.WebdriverMain(suppress_notifications = True, driver_path = args.driver_path)
+
+        phases = (
+            ("cold", True, True),
+            ("warm-disk", True, False),
+            ("warm", False, False),
+        )
+        print(f"\n{'phase':<10} {'resolve (ms)':>14} {'new_driver (ms)':>16}")
+        for name, clear_memo, clear_disk in phases:
+            resolve_s, start_s = run_phase(webd, cache_file, args.rounds, clear_memo, clear_disk)
+            print(f"{name:<10} {resolve_s * 1000:>14.1f} {start_s * 1000:>16.1f}")
+        webd.close_out()
+
+        # Each new instance reattaches to the session the previous one left behind (no close_out() in between, as after a crash)
+        session_file = os.path.join(tmp_dir, "session.json")
+        webd = WebdriverFramework.WebdriverMain(suppress_notifications = True, driver_path = args.driver_path, session_file = session_file)
+        reattach_times = []
+        for _ in range(args.rounds):
+            start = time.perf_counter()
+            webd = WebdriverFramework.WebdriverMain(suppress_notifications = True, driver_path = args.driver_path, session_file = session_file)
+            reattach_times.append(time.perf_counter() - start)
+        print(f"{'reattach':<10} {'-':>14} {statistics.median(reattach_times) * 1000:>16.1f}")
+        webd.close_out()
+
+
+if __name__ == "__main__":
+    main()
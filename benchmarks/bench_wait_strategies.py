@@ -0,0 +1,109 @@
+# Wait strategy benchmark: latency and round trips of find_ele() for elements that appear after a delay, per wait strategy (see WAIT_STRATEGIES).
+# Default mode needs Chrome: a local test page adds the element with setTimeout after a random delay, so "dead time" (found time minus the delay) is exact.
+# --fake runs offline against the fake WebDriver server instead ("late" elements appear late_after seconds after navigation). The fake server doesn't run
+# scripts, so "observe" shows its fallback path there.
+# Reports per strategy: median/p90 dead time and median WebDriver commands per find_ele().
+# Usage: python benchmarks/bench_wait_strategies.py [--rounds 20] [--max-delay 1.5] [--fake]
+import argparse
+import os
+import random
+import statistics
+import sys
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, urlparse
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+import WebdriverFramework
+from fake_webdriver_server import FakeWebdriverServer
+
+# The element appears delay_ms after the page is parsed
+TEST_PAGE = """<html><head><title>Wait benchmark</title></head><body><div id="container"></div><script>
+setTimeout(function() {{
+    var el = document.createElement("button");
+    el.id = "late-button";
+    el.textContent = "Ready";
+    document.getElementById("container").appendChild(el);
+}}, {delay_ms});
+</script></body></html>"""
+
+
+class PageHandler(BaseHTTPRequestHandler):
+    def log_message(self, format, *args): pass
+
+    def do_GET(self):
+        delay_ms = int(parse_qs(urlparse(self.path).query).get("delay", ["0"])[0])
+        body = TEST_PAGE.format(delay_ms = delay_ms).encode()
+        self.send_response(200)
+        self.send_header("Content-Type", "text/html")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+
+def percentile(values, fraction):
+    values = sorted(values)
+    return values[min(len(values) - 1, int(len(values) * fraction))]
+
+
+# Runs rounds find_ele() calls with one strategy. navigate(delay) loads a page whose element appears delay seconds later.
+def run_strategy(webd, strategy, navigate, delays):
+    dead_times, commands = [], []
+    for delay in delays:
+        navigate(delay)
+        loaded = time.perf_counter()
+        webd.reset_command_stats()
+        found = webd.find_ele(webd.main_win_handle, "id", "late-button", "late button", wait_time = delay + 5, wait_strategy = strategy)
+        elapsed = time.perf_counter() - loaded
+        if found == False: continue
+        dead_times.append(max(elapsed - delay, 0))
+        commands.append(webd.command_stats()["find_ele"]["commands"])
+    return dead_times, commands
+
+
+def main():
+    parser = argparse.ArgumentParser(description = "Compare element wait strategies.")
+    parser.add_argument("--rounds", type = int, default = 20)
+    parser.add_argument("--max-delay", type = float, default = 1.5, help = "elements appear after a random delay up to this many seconds")
+    parser.add_argument("--fake", action = "store_true", help = "run against the fake WebDriver server instead of Chrome")
+    args = parser.parse_args()
+
+    rng = random.Random(1)
+    delays = [rng.uniform(0.05, args.max_delay) for _ in range(args.rounds)]
+
+    if args.fake:
+        server = FakeWebdriverServer().start()
+        webd = WebdriverFramework.WebdriverMain(suppress_notifications = True, interactive = False, executor_url = server.url)
+
+        def navigate(delay):
+            server.late_after = delay
+            webd.get_url(webd.main_win_handle, "http://fake.test/")
+    else:
+        server = ThreadingHTTPServer(("127.0.0.1", 0), PageHandler)
+        threading.Thread(target = server.serve_forever, daemon = True).start()
+        webd = WebdriverFramework.WebdriverMain(suppress_notifications = True, profile = "headless-fast")
+        base_url = f"http://127.0.0.1:{server.server_address[1]}/"
+
+        def navigate(delay): webd.get_url(webd.main_win_handle, f"{base_url}?delay={int(delay * 1000)}")
+
+    print(f"\n{'strategy':<10} {'dead p50 (ms)':>14} {'dead p90 (ms)':>14} {'commands p50':>13}")
+    for strategy in WebdriverFramework.WAIT_STRATEGIES:
+        dead_times, commands = run_strategy(webd, strategy, navigate, delays)
+        if dead_times == []:
+            print(f"{strategy:<10} {'no element found':>43}")
+            continue
+        print(
+            f"{strategy:<10} {statistics.median(dead_times) * 1000:>14.1f} {percentile(dead_times, 0.9) * 1000:>14.1f} "
+            f"{statistics.median(commands):>13.1f}"
+        )
+
+    webd.close_out()
+    if args.fake: server.stop()
+    else: server.shutdown()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,308 @@
+import sys
+
+if __name__ == "__main__":
+    input("This is a supporting file. Do not execute.\n\nPress Enter to exit.")
+    sys.exit()
+
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+import itertools
+import json
+import threading
+import time
+import urllib.parse
+import uuid
+
+# In-process stand-in for chromedriver. Speaks enough of the W3C WebDriver HTTP protocol for WebdriverMain to run against it without a browser:
+# sessions, windows, navigation, element finds, clicks, send_keys, actions, cookies (also through the CDP cookie commands), page source and a few no-op endpoints
+# (timeouts, window rect, other CDP commands).
+# Page model (per window):
+    # Any selector is found, except selectors whose search_for contains "missing" (never found) or "late" (found once late_after seconds have passed since the last navigation).
+    # find_elements returns elements_per_find elements for a found selector.
+    # Navigating (or refreshing) a window bumps its generation. Elements found before that become stale.
+# latency adds a fixed delay (seconds) to every request so that framework overhead can be separated from "browser" time.
+# Scripts are not executed. Scripts tagged with LOCATE_MARKER (the batched locator script used by WebdriverMain) are answered with the same page model. All other scripts return None.
+# OBSERVE_MARKER scripts (the MutationObserver wait) are answered right away if everything required is already found, else with a "javascript error",
+# which makes WebdriverMain fall back to native find_elements polling (as it does in a browser where scripts are blocked).
+
+ELEMENT_KEY = "element-6066-11e4-a52e-4f735466cecf"
+LOCATE_MARKER = "/* webdriver-framework:locate */"
+OBSERVE_MARKER = "/* webdriver-framework:observe */"
+
+DEFAULT_PAGE_HTML = (
+    "<html><head><title>Fake page</title></head><body><table id='results'>"
+    + "".join(
+        f"<tr class='row' id='row{i}'><td class='name'>Item {i}</td><td class='price'>{i}.99</td><td><a href='/item/{i}'>Details {i}</a></td></tr>"
+        for i in range(200)
+    )
+    + "</table></body></html>"
+)
+
+
+class FakeWebdriverServer:
+    def __init__(self,
+            host = "127.0.0.1",
+            port = 0,
+            latency = 0.0,
+            late_after = 0.5,
+            elements_per_find = 3,
+            page_html = DEFAULT_PAGE_HTML
+    ):
+        self.latency = latency
+        self.late_after = late_after
+        self.elements_per_find = elements_per_find
+        self.page_html = page_html
+
+        self.sessions = {}
+        self.request_count = 0
+        self.lock = threading.Lock()
+        self._ids = itertools.count(1)
+        self._elements = {} # element id -> (window handle, page generation, search_for)
+        self._element_ids = {} # (window handle, page generation, using, search_for, index) -> element id
+
+        self.httpd = ThreadingHTTPServer((host, port), self._make_handler())
+        self.httpd.daemon_threads = True
+        self.thread = None
+
+    # URL to pass as command_executor/executor_url
+    @property
+    def url(self):
+        host, port = self.httpd.server_address[:2]
+        return f"http://{host}:{port}"
+
+    def start(self):
+        self.thread = threading.Thread(target = self.httpd.serve_forever, daemon = True)
+        self.thread.start()
+        return self
+
+    def stop(self):
+        self.httpd.shutdown()
+        self.httpd.server_close()
+
+    def __enter__(self): return self.start()
+
+    def __exit__(self, exc_type, exc, tb): self.stop()
+
+    # Resets the request counter and returns the previous value
+    def reset_count(self):
+        with self.lock:
+            count, self.request_count = self.request_count, 0
+        return count
+
+    def _make_handler(self):
+        server = self
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = "HTTP/1.1"
+            disable_nagle_algorithm = True # Otherwise small keep-alive responses wait for delayed ACKs (~40 ms per request)
+
+            def log_message(self, format, *args): pass
+
+            def do_GET(self): self._dispatch("GET")
+
+            def do_POST(self): self._dispatch("POST")
+
+            def do_DELETE(self): self._dispatch("DELETE")
+
+            def _dispatch(self, method):
+                length = int(self.headers.get("Content-Length") or 0)
+                raw = self.rfile.read(length) if length else b""
+                body = json.loads(raw) if raw else {}
+
+                if server.latency: time.sleep(server.latency)
+
+                with server.lock:
+                    server.request_count += 1
+                    status, value = server.handle(method, self.path.rstrip("/").split("/")[1:], body)
+
+                payload = json.dumps({"value": value}).encode("utf-8")
+                self.send_response(status)
+                self.send_header("Content-Type", "application/json; charset=utf-8")
+                self.send_header("Content-Length", str(len(payload)))
+                self.end_headers()
+                self.wfile.write(payload)
+
+        return Handler
+
+    # ----------------------------PROTOCOL----------------------------
+    # Called with self.lock held. parts is the URL path split on "/". Returns (http status, value).
+    def handle(self, method, parts, body):
+        if parts == ["status"]: return 200, {"ready": True, "message": "fake webdriver server"}
+
+        if parts[:1] != ["session"]: return self._error("unknown command", "/".join(parts))
+
+        if len(parts) == 1 and method == "POST": return self._new_session()
+
+        session = self.sessions.get(parts[1])
+        if session is None: return self._error("invalid session id", parts[1])
+
+        command = parts[2:]
+
+        if command == [] and method == "DELETE":
+            del self.sessions[parts[1]]
+            return 200, None
+
+        match (method, command[:1]):
+            case (_, ["timeouts"]): return 200, None
+            case (_, ["goog"]): return self._cdp(session, body)
+            case ("POST", ["url"]):
+                session["windows"][session["current"]] = self._new_page(body.get("url", ""))
+                return 200, None
+            case ("GET", ["url"]): return self._page(session, lambda page: page["url"])
+            case ("GET", ["title"]): return self._page(session, lambda page: "Fake page")
+            case ("GET", ["source"]): return self._page(session, lambda page: self.page_html)
+            case (_, ["refresh"]):
+                if session["current"] not in session["windows"]: return self._no_window(session)
+                url = session["windows"][session["current"]]["url"]
+                session["windows"][session["current"]] = self._new_page(url)
+                return 200, None
+            case (_, ["window"]): return self._window(session, method, command[1:], body)
+            case ("POST", ["element"]) if len(command) == 1: return self._find(session, body, multiple = False)
+            case ("POST", ["elements"]): return self._find(session, body, multiple = True)
+            case (_, ["element"]): return self._element(session, method, command[1:], body)
+            case ("POST", ["execute"]): return self._execute(session, body)
+            case (_, ["actions"]): return self._page(session, lambda page: None)
+            case (_, ["cookie"]): return self._cookie(session, method, command[1:], body)
+
+        return self._error("unknown command", "/".join(command))
+
+    def _new_session(self):
+        session_id = uuid.uuid4().hex
+        handle = self._new_handle()
+        self.sessions[session_id] = {"windows": {handle: self._new_page("about:blank")}, "current": handle, "cookies": {}}
+        return 200, {
+            "sessionId": session_id,
+            "capabilities": {"browserName": "chrome", "browserVersion": "0.0", "platformName": "any", "pageLoadStrategy": "normal"},
+        }
+
+    def _new_handle(self): return f"FAKE-WINDOW-{next(self._ids)}"
+
+    def _new_page(self, url): return {"url": url, "loaded_at": time.monotonic(), "generation": next(self._ids)}
+
+    def _page(self, session, getter):
+        page = session["windows"].get(session["current"])
+        if page is None: return self._no_window(session)
+        return 200, getter(page)
+
+    def _window(self, session, method, sub, body):
+        match (method, sub):
+            case ("GET", []):
+                if session["current"] not in session["windows"]: return self._no_window(session)
+                return 200, session["current"]
+            case ("POST", []):
+                handle = body.get("handle")
+                if handle not in session["windows"]: return self._error("no such window", f"No window with handle {handle}")
+                session["current"] = handle
+                return 200, None
+            case ("DELETE", []):
+                session["windows"].pop(session["current"], None)
+                return 200, list(session["windows"])
+            case ("GET", ["handles"]): return 200, list(session["windows"])
+            case ("POST", ["new"]):
+                handle = self._new_handle()
+                session["windows"][handle] = self._new_page("about:blank")
+                return 200, {"handle": handle, "type": body.get("type", "tab")}
+            case (_, ["rect"]): return 200, {"x": 0, "y": 0, "width": body.get("width", 800), "height": body.get("height", 600)}
+            case (_, _): return 200, None
+
+    # Applies the page model to one selector. Returns a list of element references (possibly empty).
+    def _locate(self, session, using, value):
+        handle = session["current"]
+        page = session["windows"][handle]
+
+        if "missing" in value: return []
+        if "late" in value and time.monotonic() - page["loaded_at"] < self.late_after: return []
+
+        found = []
+        for index in range(self.elements_per_find):
+            key = (handle, page["generation"], using, value, index)
+            if key not in self._element_ids:
+                self._element_ids[key] = f"fake-element-{next(self._ids)}"
+                self._elements[self._element_ids[key]] = (handle, page["generation"], value)
+            found.append({ELEMENT_KEY: self._element_ids[key]})
+        return found
+
+    def _find(self, session, body, multiple):
+        if session["current"] not in session["windows"]: return self._no_window(session)
+
+        found = self._locate(session, body.get("using", ""), body.get("value", ""))
+        if multiple: return 200, found
+        if found == []: return self._error("no such element", f"Unable to locate element: {body}")
+        return 200, found[0]
+
+    def _element(self, session, method, sub, body):
+        if session["current"] not in session["windows"]: return self._no_window(session)
+
+        element_id = sub[0]
+        handle, generation, value = self._elements.get(element_id, (None, None, None))
+        page = session["windows"].get(handle)
+        if handle != session["current"] or page is None or page["generation"] != generation:
+            return self._error("stale element reference", f"Element {element_id} is stale")
+
+        match (method, sub[1:]):
+            case ("GET", ["name"]): return 200, "input"
+            case ("GET", ["text"]): return 200, value
+            case ("GET", ["enabled"] | ["displayed"] | ["selected"]): return 200, True
+            case ("GET", ["attribute", _] | ["property", _] | ["css", _]): return 200, None
+            case ("POST", ["click"] | ["value"] | ["clear"]): return 200, None
+
+        return self._error("unknown command", "/".join(sub))
+
+    def _execute(self, session, body):
+        if session["current"] not in session["windows"]: return self._no_window(session)
+
+        script = body.get("script", "")
+        if LOCATE_MARKER not in script and OBSERVE_MARKER not in script: return 200, None
+
+        # Batched locator script. args[0] is a list of [name, search_by, search_for, multiple].
+        args = body.get("args", [[]])
+        found = {}
+        for name, search_by, search_for, multiple in args[0]:
+            elements = self._locate(session, search_by, search_for)
+            if multiple: found[name] = elements
+            else: found[name] = elements[0] if elements else None
+
+        if OBSERVE_MARKER in script:
+            if any(found.get(name) in (None, []) for name in args[1]): return self._error("javascript error", "The fake server does not run scripts")
+            return 200, {"complete": True, "found": found}
+        return 200, found
+
+    # Chrome DevTools Protocol commands. Only the cookie commands do anything; the rest are accepted and ignored.
+    def _cdp(self, session, body):
+        params = body.get("params", {})
+        match body.get("cmd"):
+            case "Network.getAllCookies": return 200, {"cookies": list(session["cookies"].values())}
+            case "Network.setCookie":
+                cookie = {key: params[key] for key in ("name", "value", "domain", "path", "secure", "httpOnly", "sameSite") if key in params}
+                # Like Chrome: a cookie without a domain is host-only, for the host of its url
+                if "domain" not in cookie:
+                    if "url" not in params: return self._error("invalid argument", "At least one of the url or domain needs to be specified")
+                    cookie["domain"] = urllib.parse.urlsplit(params["url"]).hostname
+                if "expires" in params: cookie["expiry"] = int(params["expires"])
+                session["cookies"][cookie.get("name")] = cookie
+                return 200, {"success": True}
+        return 200, {}
+
+    def _cookie(self, session, method, sub, body):
+        match (method, sub):
+            case ("GET", []): return 200, list(session["cookies"].values())
+            case ("POST", []):
+                cookie = body.get("cookie", {})
+                session["cookies"][cookie.get("name")] = cookie
+                return 200, None
+            case ("DELETE", []):
+                session["cookies"].clear()
+                return 200, None
+            case ("GET", [name]):
+                if name not in session["cookies"]: return self._error("no such cookie", name)
+                return 200, session["cookies"][name]
+            case ("DELETE", [name]):
+                session["cookies"].pop(name, None)
+                return 200, None
+
+        return self._error("unknown command", "/".join(sub))
+
+    def _no_window(self, session): return self._error("no such window", f"Window {session['current']} was closed")
+
+    def _error(self, error, message):
+        status = {"javascript error": 500, "invalid session id": 404, "no such element": 404, "no such window": 404, "no such cookie": 404, "stale element reference": 404, "unknown command": 404}.get(error, 500)
+        return status, {"error": error, "message": message, "stacktrace": ""}
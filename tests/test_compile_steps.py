@@ -0,0 +1,56 @@
+from WebdriverFramework import _compile_steps
+
+
+def test_login_flow_batches_until_enter():
+    steps = [
+        ("navigate", "https://example.com/login", "login page"),
+        ("type", "id", "username", "me", "username box"),
+        ("type", "id", "password", "secret", "password box"),
+        ("press_enter", "id", "password", "password box"),
+        ("wait_for", "id", "account-menu", "account menu"),
+    ]
+    assert _compile_steps(steps) == [[0], [1, 2, 3], [4]]
+
+
+def test_wait_for_after_typing_starts_a_new_batch():
+    steps = [
+        ("type", "id", "q", "abc", "search box"),
+        ("wait_for", "css_selector", ".suggestion", "suggestions"),
+        ("click", "css_selector", ".suggestion", "first suggestion"),
+    ]
+    assert _compile_steps(steps) == [[0], [1, 2]]
+
+
+def test_find_after_typing_starts_a_new_batch():
+    steps = [
+        ("find", "id", "form", "form"),
+        ("type", "id", "q", "abc", "search box"),
+        ("find", "id", "hint", "hint"),
+        ("type", "id", "r", "def", "second box"),
+    ]
+    assert _compile_steps(steps) == [[0, 1], [2, 3]]
+
+
+def test_lookups_before_typing_share_a_batch():
+    steps = [
+        ("wait_for", "id", "form", "form"),
+        ("find", "id", "q", "search box"),
+        ("type", "id", "q", "abc", "search box"),
+        ("type", "id", "r", "def", "second box"),
+    ]
+    assert _compile_steps(steps) == [[0, 1, 2, 3]]
+
+
+def test_click_ends_a_batch_and_navigate_stands_alone():
+    steps = [
+        ("click", "id", "a", "a"),
+        ("click", "id", "b", "b"),
+        ("type", "id", "c", "x", "c"),
+        ("navigate", "https://example.com/", "page"),
+        ("press_enter", "id", "d", "d"),
+    ]
+    assert _compile_steps(steps) == [[0], [1], [2], [3], [4]]
+
+
+def test_no_steps():
+    assert _compile_steps([]) == []
@@ -0,0 +1,49 @@
+import json
+import os
+import threading
+
+from WebdriverFramework import ErrorStore, _STOP_WRITER
+
+
+def test_rotation_keeps_backup_count_files(tmp_path):
+    path = str(tmp_path / "errors.jsonl")
+    store = ErrorStore(jsonl_path = path, max_bytes = 500, backup_count = 2)
+    for i in range(60): store.record(ValueError(f"error {i}"), "fail message")
+    store.close()
+
+    assert sorted(os.listdir(tmp_path)) == ["errors.jsonl", "errors.jsonl.1", "errors.jsonl.2"]
+    for name in os.listdir(tmp_path):
+        assert os.path.getsize(tmp_path / name) <= 500
+    with open(path, encoding = "utf-8") as f: last = [json.loads(line) for line in f][-1]
+    assert last["error"] == "error 59" and last["type"] == "ValueError"
+    assert store.total == 60 and store.dropped == 0
+
+
+def test_close_returns_when_the_file_cannot_be_written(tmp_path):
+    store = ErrorStore(jsonl_path = str(tmp_path / "missing" / "dir" / "errors.jsonl"), queue_size = 5)
+    for i in range(10): store.record(f"error {i}")
+
+    closer = threading.Thread(target = store.close)
+    closer.start()
+    closer.join(15)
+    assert closer.is_alive() == False
+    assert store.total == 10
+    assert store.dropped == 10 # Failed writes plus errors that didn't fit the queue
+
+    store.record("after close") # Memory only, no exception
+    assert store.total == 11
+
+
+def test_close_with_a_dead_writer_does_not_block(tmp_path):
+    store = ErrorStore(jsonl_path = str(tmp_path / "errors.jsonl"), queue_size = 5)
+    # Ends the writer thread behind the store's back, then fills the queue nobody reads any more
+    store._queue.put(_STOP_WRITER)
+    store._writer.join(5)
+    assert store._writer.is_alive() == False
+    for i in range(10): store.record(f"error {i}")
+    assert store.dropped == 5
+
+    closer = threading.Thread(target = store.close)
+    closer.start()
+    closer.join(15)
+    assert closer.is_alive() == False
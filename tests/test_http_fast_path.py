@@ -0,0 +1,76 @@
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, urlencode, urlsplit
+
+import pytest
+
+pytest.importorskip("requests")
+from WebdriverFramework import HttpFastPath
+
+
+# Local server that answers every GET with the Set-Cookie headers in the query string's "set" values (one per header)
+class CookieHandler(BaseHTTPRequestHandler):
+    def log_message(self, format, *args): pass
+
+    def do_GET(self):
+        self.send_response(200)
+        self.send_header("Content-Type", "text/html")
+        self.send_header("Content-Length", "0")
+        for set_cookie in parse_qs(urlsplit(self.path).query).get("set", []): self.send_header("Set-Cookie", set_cookie)
+        self.end_headers()
+
+
+@pytest.fixture
+def base_url():
+    httpd = ThreadingHTTPServer(("127.0.0.1", 0), CookieHandler)
+    threading.Thread(target = httpd.serve_forever, daemon = True).start()
+    yield f"http://127.0.0.1:{httpd.server_address[1]}"
+    httpd.shutdown()
+    httpd.server_close()
+
+
+# Cookies the server sets with set_cookies, as name -> (url, cookie) from pop_new_cookies()
+def new_cookies(base_url, *set_cookies):
+    fast_path = HttpFastPath()
+    fast_path.get(f"{base_url}/?{urlencode([('set', set_cookie) for set_cookie in set_cookies])}")
+    cookies = {cookie["name"]: (url, cookie) for url, cookie in fast_path.pop_new_cookies()}
+    fast_path.close()
+    return cookies
+
+
+def test_cookie_without_samesite_leaves_it_out(base_url):
+    url, cookie = new_cookies(base_url, "plain=1; Path=/")["plain"]
+    assert cookie["value"] == "1"
+    assert "sameSite" not in cookie
+    assert cookie["httpOnly"] == False
+
+
+def test_samesite_and_httponly_are_kept_in_any_spelling(base_url):
+    cookies = new_cookies(base_url, "a=1; Path=/; HttpOnly; SameSite=lax", "b=2; Path=/; httponly; samesite=Strict")
+    assert (cookies["a"][1]["sameSite"], cookies["a"][1]["httpOnly"]) == ("Lax", True)
+    assert (cookies["b"][1]["sameSite"], cookies["b"][1]["httpOnly"]) == ("Strict", True)
+
+
+def test_unknown_samesite_value_is_left_out(base_url):
+    assert "sameSite" not in new_cookies(base_url, "c=3; Path=/; SameSite=bogus")["c"][1]
+
+
+def test_host_only_cookie_has_url_instead_of_domain(base_url):
+    url, cookie = new_cookies(base_url, "host=1; Path=/app")["host"]
+    assert "domain" not in cookie
+    assert url == "http://127.0.0.1/app"
+
+
+def test_domain_cookie_keeps_its_domain(base_url):
+    url, cookie = new_cookies(base_url, "wide=1; Path=/; Domain=127.0.0.1")["wide"]
+    assert cookie["domain"] == ".127.0.0.1"
+
+
+def test_cookies_are_popped_once(base_url):
+    fast_path = HttpFastPath()
+    fast_path.get(f"{base_url}/?set=d%3D4")
+    assert [cookie["name"] for url, cookie in fast_path.pop_new_cookies()] == ["d"]
+    assert fast_path.pop_new_cookies() == []
+    fast_path.get(f"{base_url}/?set=d%3D4") # Same value: not new
+    assert fast_path.pop_new_cookies() == []
+    fast_path.close()